@@ -0,0 +1,15 @@
+from backtester.cache import load_table, read_csv, sniff_delimiter, CachedTable, product_index, load_product, read_product, ProductIndex
+from backtester.replay import PriceReplay
+from backtester.matching import MatchingEngine, POSITION_LIMITS, SUBMISSION
+from backtester.engine import Backtest, BacktestResult
+from backtester.shared import SharedReplay, attach_replay
+from backtester.sweep import sweep, grid_search, random_search
+from backtester.multiday import backtest_days, MultiDayResult
+from backtester.ledger import Ledger, mark_prices, MARK_METHODS
+from backtester.streams import trading_states, merged_events
+from backtester.conversions import ConversionEngine, align_observations
+from backtester.profiler import LatencyProfiler, TIME_BUDGET_NS
+from backtester.compact import TradeBatch
+from backtester.recording import StateWriter, encode, decode, read_records
+from backtester.report import render_report, CHART_GROUPS
+from backtester.attribution import Attribution, attribute, load_trades
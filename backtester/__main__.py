@@ -0,0 +1,91 @@
+import argparse
+import ast
+import importlib
+from backtester.sweep import sweep, grid_search, random_search
+from backtester.multiday import backtest_days
+from backtester.replay import PriceReplay
+from backtester.engine import Backtest
+from backtester.conversions import ConversionEngine
+from backtester.profiler import LatencyProfiler
+from backtester.report import render_report, CHART_GROUPS
+
+
+def parse_space(assignments):
+    """Parse NAME=VALUES arguments into a search space.
+
+    VALUES is a Python literal, either a list of candidates or a (low, high) range.
+    """
+    space = {}
+    for assignment in assignments:
+        name, values = assignment.split('=', 1)
+        space[name] = ast.literal_eval(values)
+    return space
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m backtester', description="Backtest tools for the Trader.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sweep_parser = commands.add_parser('sweep', help="rank Trader parameter configurations by backtest PnL")
+    sweep_parser.add_argument('data', help="prices CSV to backtest on")
+    sweep_parser.add_argument('params', nargs='+', help="search space entries, e.g. alpha=[0.2,0.33] or translation=(300,400)")
+    sweep_parser.add_argument('--products', nargs='*', help="products to replay (default: all in the file)")
+    sweep_parser.add_argument('--samples', type=int, help="random search with this many samples instead of a full grid")
+    sweep_parser.add_argument('--seed', type=int, help="random search seed")
+    sweep_parser.add_argument('--processes', type=int, help="worker processes (default: all cores)")
+    sweep_parser.add_argument('--trader', default='trader', help="module to import the Trader class from")
+    sweep_parser.add_argument('--output', help="write the ranked table to this CSV")
+
+    multiday_parser = commands.add_parser('multiday', help="backtest each day of one or more prices files in parallel")
+    multiday_parser.add_argument('data', nargs='+', help="prices CSVs to backtest")
+    multiday_parser.add_argument('--days', nargs='*', type=int, help="days to backtest (default: every day in each file)")
+    multiday_parser.add_argument('--products', nargs='*', help="products to replay (default: all in the file)")
+    multiday_parser.add_argument('--processes', type=int, help="worker processes (default: all cores)")
+    multiday_parser.add_argument('--trader', default='trader', help="module to import the Trader class from")
+    multiday_parser.add_argument('--output', help="write the merged per-tick PnL and position series to this CSV")
+
+    profile_parser = commands.add_parser('profile', help="backtest with per-strategy latency profiling")
+    profile_parser.add_argument('data', help="prices CSV to backtest on")
+    profile_parser.add_argument('--observations', nargs='*', help="ORCHIDS observations CSVs, to simulate conversions")
+    profile_parser.add_argument('--products', nargs='*', help="products to replay (default: all in the file)")
+    profile_parser.add_argument('--budget-ms', type=float, default=900, help="per-tick time budget of Trader.run in ms")
+    profile_parser.add_argument('--trader', default='trader', help="module to import the Trader class from")
+
+    report_parser = commands.add_parser('report', help="render every analysis chart to files without a display")
+    report_parser.add_argument('--output', default='report', help="directory to write the figures and index.html to")
+    report_parser.add_argument('--groups', nargs='*', choices=list(CHART_GROUPS), help="chart groups to render (default: all)")
+    report_parser.add_argument('--processes', type=int, help="worker processes (default: one per group)")
+
+    args = parser.parse_args()
+
+    if args.command == 'sweep':
+        space = parse_space(args.params)
+        configs = random_search(space, args.samples, args.seed) if args.samples else grid_search(space)
+        results = sweep(args.data, configs, args.products, args.processes, args.trader)
+        print(results.to_string())
+        if args.output:
+            results.to_csv(args.output, index=False)
+
+    elif args.command == 'multiday':
+        results = backtest_days(args.data, args.days, args.products, args.processes, args.trader)
+        print(results.summary().to_string())
+        if args.output:
+            results.series().to_csv(args.output, index=False)
+
+    elif args.command == 'profile':
+        replay = PriceReplay(args.data, args.products)
+        conversions = ConversionEngine(replay, args.observations) if args.observations else None
+        profiler = LatencyProfiler(int(args.budget_ms * 1e6))
+        trader = importlib.import_module(args.trader).Trader()
+        result = Backtest(trader, replay, conversions=conversions, profiler=profiler).run()
+        print(result.summary())
+        print(profiler.report())
+
+    elif args.command == 'report':
+        results = render_report(args.output, args.groups, args.processes)
+        print(results.to_string(index=False))
+        print(f"Report written to {args.output}/index.html")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+from backtester.cache import load_table
+
+# Columns of the market trade files that the attribution reads
+TRADE_COLUMNS = ['buyer', 'seller', 'symbol', 'price', 'quantity']
+
+
+def load_trades(csv_files: List[str]) -> Dict[str, np.ndarray]:
+    """Load market trade files as arrays, through the binary cache.
+
+    Args:
+        csv_files (List[str]): Trade files with buyer, seller, symbol, price and quantity columns.
+
+    Returns:
+        Dict[str, np.ndarray]: The concatenated columns, with names as text.
+    """
+    parts = []
+    for csv_file in csv_files:
+        table = load_table(csv_file)
+        parts.append({'buyer': table.decode('buyer'), 'seller': table.decode('seller'), 'symbol': table.decode('symbol'),
+                      'price': np.asarray(table['price'], dtype=np.float64),
+                      'quantity': np.asarray(table['quantity'], dtype=np.int64)})
+    return {column: np.concatenate([part[column] for part in parts]) for column in TRADE_COLUMNS}
+
+
+def last_prices(trades: Dict[str, np.ndarray]) -> Dict[str, Tuple[float, float]]:
+    """Return the last traded price of every symbol as both its closing bid and ask."""
+    symbols, index = np.unique(trades['symbol'][::-1], return_index=True)
+    prices = trades['price'][::-1][index]
+    return {symbol: (price, price) for symbol, price in zip(symbols, prices)}
+
+
+def group_keys(keys: np.ndarray, key_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the distinct keys in increasing order and the group of every key, as np.unique(keys, return_inverse=True).
+
+    When there are no more possible keys than keys, the groups are found in O(n) by
+    counting every possible key instead of sorting.
+    """
+    if key_count > len(keys):
+        return np.unique(keys, return_inverse=True)
+    present = np.bincount(keys, minlength=key_count) > 0
+    groups = np.cumsum(present) - 1
+    return np.flatnonzero(present), groups[keys]
+
+
+class Attribution:
+    """
+    The cash flow, net position and marked PnL of every trader, split by symbol and by counterparty.
+
+    Every trade is two legs: the buyer's, long the quantity and paying price * quantity,
+    and the seller's, short the quantity and receiving it. Traders and symbols are
+    factorized from the data into integer codes, each leg gets one integer key for its
+    (trader, symbol, counterparty) group, and bincount sums the cash, positions and trade
+    counts of every group in one pass. Only the groups that traded are stored, so memory
+    grows with the trades and not with the number of traders squared.
+
+    Open positions are marked at the closing ask when long and the closing bid when short,
+    as round_5/pnlr5.py always has. This is not what closing them would fetch: a long is
+    sold at the bid and a short bought back at the ask, as the Ledger's 'best' mark assumes,
+    so each open position is valued higher by the spread times its size.
+    """
+
+    def __init__(self, trades: Dict[str, np.ndarray], closings: Dict[str, Tuple[float, float]] = None):
+        """Attribute a set of trades.
+
+        Args:
+            trades (Dict[str, np.ndarray]): The buyer, seller, symbol, price and quantity of every trade.
+            closings (Dict[str, Tuple[float, float]], optional): The (bid, ask) each symbol is marked at.
+                Defaults to the last traded price of each symbol.
+        """
+        closings = last_prices(trades) if closings is None else closings
+        trader_codes, traders = pd.factorize(np.concatenate((trades['buyer'], trades['seller'])))
+        symbol_codes, symbols = pd.factorize(trades['symbol'])
+        self.traders, self.symbols = np.asarray(traders, dtype=object), np.asarray(symbols, dtype=object)
+        buyers, sellers = np.split(trader_codes.astype(np.int64), 2)
+
+        # The buyer's and the seller's leg of every trade, keyed by (trader, symbol, counterparty)
+        count, symbol_count = len(self.traders), len(self.symbols)
+        quantity = np.asarray(trades['quantity'], dtype=np.int64)
+        notional = np.asarray(trades['price'], dtype=np.float64) * quantity
+        keys = np.concatenate(((buyers * symbol_count + symbol_codes) * count + sellers,
+                               (sellers * symbol_count + symbol_codes) * count + buyers))
+        keys, groups = group_keys(keys, count * symbol_count * count)
+        self.cash = np.bincount(groups, weights=np.concatenate((-notional, notional)), minlength=len(keys))
+        self.position = np.bincount(groups, weights=np.concatenate((quantity, -quantity)), minlength=len(keys)).astype(np.int64)
+        self.trades = np.bincount(groups, minlength=len(keys))
+
+        self.trader = keys // (symbol_count * count)
+        self.symbol = keys // count % symbol_count
+        self.counterparty = keys % count
+        self.bid = np.array([closings[symbol][0] for symbol in self.symbols], dtype=np.float64)
+        self.ask = np.array([closings[symbol][1] for symbol in self.symbols], dtype=np.float64)
+
+    def mark(self, cash: np.ndarray, position: np.ndarray, symbol: np.ndarray) -> np.ndarray:
+        """Return the cash plus the positions marked at the closing ask of their symbol when long and bid when short.
+
+        See the class docstring: this is the opposite side to the close-out price.
+        """
+        return cash + np.where(position > 0, self.ask[symbol], self.bid[symbol]) * position
+
+    def pairs(self) -> pd.DataFrame:
+        """Return the trades, cash, position and marked PnL of every trader against every counterparty they traded a symbol with."""
+        return pd.DataFrame({
+            'Trader': self.traders[self.trader],
+            'Symbol': self.symbols[self.symbol],
+            'Counterparty': self.traders[self.counterparty],
+            'Trades': self.trades,
+            'Cash': self.cash,
+            'Position': self.position,
+            'PnL': self.mark(self.cash, self.position, self.symbol),
+        })
+
+    def by_symbol(self) -> pd.DataFrame:
+        """Return the trades, cash, net position and marked PnL of every trader in every symbol they traded.
+
+        Each net position is marked once, so a trader's PnL in a symbol can differ from the sum of
+        their counterparty PnLs when they are long against some counterparties and short against others.
+        """
+        # The pairs are sorted by trader then symbol, so each (trader, symbol) group is a contiguous run
+        keys = self.trader * len(self.symbols) + self.symbol
+        starts = np.flatnonzero(np.diff(keys, prepend=-1))
+        trader, symbol = self.trader[starts], self.symbol[starts]
+        cash = np.add.reduceat(self.cash, starts)
+        position = np.add.reduceat(self.position, starts)
+        return pd.DataFrame({
+            'Trader': self.traders[trader],
+            'Symbol': self.symbols[symbol],
+            'Trades': np.add.reduceat(self.trades, starts),
+            'Cash': cash,
+            'Position': position,
+            'PnL': self.mark(cash, position, symbol),
+        })
+
+    def table(self) -> pd.DataFrame:
+        """Return the marked PnL of every trader (rows) in every symbol (columns), with a total column, best first."""
+        table = self.by_symbol().pivot_table(index='Trader', columns='Symbol', values='PnL', aggfunc='sum', fill_value=0)
+        table = table.reindex(index=self.traders, columns=self.symbols, fill_value=0)
+        table['TOTAL'] = table.sum(axis=1)
+        return table.sort_values('TOTAL', ascending=False)
+
+
+def attribute(csv_files: List[str], closings: Dict[str, Tuple[float, float]] = None) -> Attribution:
+    """Load trade files and attribute their PnL by trader, symbol and counterparty."""
+    return Attribution(load_trades(csv_files), closings)
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(5)
+    count = 2_000_000
+    names = np.array([f"trader{number}" for number in range(60)], dtype=object)
+    products = np.array(['STARFRUIT', 'AMETHYSTS', 'ROSES', 'STRAWBERRIES', 'GIFT_BASKET', 'CHOCOLATE', 'COCONUT_COUPON', 'COCONUT'], dtype=object)
+    buyers = rng.integers(0, len(names), count)
+    trades = {
+        'buyer': names[buyers],
+        'seller': names[(buyers + rng.integers(1, len(names), count)) % len(names)],
+        'symbol': products[rng.integers(0, len(products), count)],
+        'price': rng.integers(500, 70_000, count).astype(np.float64),
+        'quantity': rng.integers(1, 20, count),
+    }
+    closings = {product: (1000.0 * number, 1000.0 * number + 2) for number, product in enumerate(products)}
+
+    started = time.perf_counter()
+    attribution = Attribution(trades, closings)
+    pairs, by_symbol = attribution.pairs(), attribution.by_symbol()
+    elapsed = time.perf_counter() - started
+
+    # Against a pandas groupby of the two legs of every trade
+    legs = pd.DataFrame({
+        'Trader': np.concatenate((trades['buyer'], trades['seller'])),
+        'Symbol': np.concatenate((trades['symbol'], trades['symbol'])),
+        'Counterparty': np.concatenate((trades['seller'], trades['buyer'])),
+        'Cash': np.concatenate((-trades['price'] * trades['quantity'], trades['price'] * trades['quantity'])),
+        'Position': np.concatenate((trades['quantity'], -trades['quantity'])),
+    })
+    for columns, result in ((['Trader', 'Symbol', 'Counterparty'], pairs), (['Trader', 'Symbol'], by_symbol)):
+        expected = legs.groupby(columns)[['Cash', 'Position']].sum()
+        actual = result.set_index(columns)[['Cash', 'Position']].reindex(expected.index)
+        assert np.allclose(actual['Cash'], expected['Cash']) and np.array_equal(actual['Position'], expected['Position'])
+    assert np.isclose(pairs['Cash'].sum(), 0) and pairs['Position'].sum() == 0
+
+    # A flat pair is worth its cash, a long one its cash plus the position at the ask
+    row = pairs.iloc[0]
+    bid, ask = closings[row['Symbol']]
+    assert np.isclose(row['PnL'], row['Cash'] + row['Position'] * (ask if row['Position'] > 0 else bid))
+    print(f"{count} trades, {len(pairs)} trader/symbol/counterparty groups attributed in {elapsed:.2f} s")
@@ -0,0 +1,387 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+CACHE_DIR = '.cache'
+META_FILE = 'meta.json'
+INDEX_FILE = 'index.json'
+ROWS_FILE = 'rows.npy'
+
+
+def sniff_delimiter(csv_file: str) -> str:
+    """Detect whether a prices file uses the ';' or ',' delimited layout.
+
+    Args:
+        csv_file (str): Path to the CSV file.
+
+    Returns:
+        str: The delimiter used by the header row.
+    """
+    with open(csv_file, 'r') as file:
+        header = file.readline()
+    return ';' if header.count(';') > header.count(',') else ','
+
+
+def cache_path(csv_file: str) -> str:
+    """Return the cache directory of a CSV file, next to the file itself."""
+    directory, name = os.path.split(os.path.abspath(csv_file))
+    return os.path.join(directory, CACHE_DIR, name)
+
+
+def source_stamp(csv_file: str) -> Dict[str, int]:
+    """Return the modification time and size that a cache of the file is valid for."""
+    stat = os.stat(csv_file)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def compact_column(values: pd.Series):
+    """Convert a parsed column into its most compact lossless array.
+
+    Integers become int32 when they fit, floats become float32 when every value
+    survives the round trip, and text becomes small integer codes into a list of
+    categories, with -1 for missing values.
+
+    Args:
+        values (pd.Series): The parsed column.
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: The array and the categories, or None for numeric columns.
+    """
+    if pd.api.types.is_bool_dtype(values):
+        return values.to_numpy(bool), None
+
+    if pd.api.types.is_integer_dtype(values):
+        array = values.to_numpy(np.int64)
+        if len(array) == 0 or (array.min() >= np.iinfo(np.int32).min and array.max() <= np.iinfo(np.int32).max):
+            return array.astype(np.int32), None
+        return array, None
+
+    if pd.api.types.is_float_dtype(values):
+        array = values.to_numpy(np.float64)
+        compact = array.astype(np.float32)
+        if np.array_equal(compact.astype(np.float64), array, equal_nan=True):
+            return compact, None
+        return array, None
+
+    codes, categories = pd.factorize(values)
+    dtype = np.int8 if len(categories) < 2 ** 7 else np.int16 if len(categories) < 2 ** 15 else np.int32
+    return codes.astype(dtype), [str(category) for category in categories]
+
+
+def replace_file(path: str, data: bytes) -> None:
+    """Write a file under a unique temporary name next to it and move it into place.
+
+    Concurrent writers never share the temporary file, and readers see either the
+    old file or the complete new one.
+    """
+    handle, temporary = tempfile.mkstemp(prefix=os.path.basename(path) + '.', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def read_meta(path: str):
+    """Return the JSON metadata in a file, or None if it is missing or unreadable."""
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def publish_directory(building: str, directory: str, stamp: Dict[str, int]) -> None:
+    """Move a complete cache directory into place, replacing a stale one.
+
+    If a concurrent build already published a cache of the same source, that one is
+    kept, so readers of it never lose their files, and this one is discarded.
+    """
+    try:
+        os.replace(building, directory)
+        return
+    except OSError:
+        pass
+
+    meta = read_meta(os.path.join(directory, META_FILE))
+    if meta is not None and meta['source'] == stamp:
+        shutil.rmtree(building, ignore_errors=True)
+        return
+
+    # Move the stale directory aside first, as a directory cannot replace a non-empty one
+    stale = tempfile.mkdtemp(prefix=os.path.basename(directory) + '.stale.', dir=os.path.dirname(directory))
+    try:
+        os.replace(directory, stale)
+    except FileNotFoundError:
+        pass
+    try:
+        os.replace(building, directory)
+    except OSError:
+        shutil.rmtree(building, ignore_errors=True)
+    shutil.rmtree(stale, ignore_errors=True)
+
+
+def build_cache(csv_file: str) -> dict:
+    """Parse a CSV file and write its columns as .npy files.
+
+    The cache is built in a private temporary directory and moved into place once
+    complete, so an interrupted build is never loaded and concurrent first builds,
+    such as parallel report workers, cannot interleave their files.
+
+    Args:
+        csv_file (str): Path to a ';' or ',' delimited CSV file.
+
+    Returns:
+        dict: The metadata of the new cache.
+    """
+    directory = cache_path(csv_file)
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+
+    stamp = source_stamp(csv_file)
+    df = pd.read_csv(csv_file, sep=sniff_delimiter(csv_file))
+
+    building = tempfile.mkdtemp(prefix=os.path.basename(directory) + '.build.', dir=parent)
+    try:
+        meta = {'source': stamp, 'rows': len(df), 'columns': []}
+        for index, name in enumerate(df.columns):
+            array, categories = compact_column(df[name])
+            file_name = f'{index}.npy'
+            np.save(os.path.join(building, file_name), array)
+            meta['columns'].append({'name': name, 'file': file_name, 'categories': categories})
+
+        with open(os.path.join(building, META_FILE), 'w') as file:
+            json.dump(meta, file)
+    except BaseException:
+        shutil.rmtree(building, ignore_errors=True)
+        raise
+
+    publish_directory(building, directory, stamp)
+    return meta
+
+
+class CachedTable:
+    """
+    The columns of a cached CSV file, memory-mapped read-only.
+
+    Indexing by column name returns the compact array as stored, which for text
+    columns are the category codes. Use decode() for the text values and frame()
+    for a pandas DataFrame with the same values and dtypes as pd.read_csv.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], categories: Dict[str, List[str]]):
+        self.columns = columns
+        self.categories = categories
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def take(self, rows: np.ndarray) -> 'CachedTable':
+        """Return a table of the given rows only, read from the memory-mapped columns."""
+        return CachedTable({name: array[rows] for name, array in self.columns.items()}, self.categories)
+
+    def code(self, name: str, value: str) -> int:
+        """Return the code of a category value, or -1 if it never occurs."""
+        categories = self.categories[name]
+        return categories.index(value) if value in categories else -1
+
+    def decode(self, name: str) -> np.ndarray:
+        """Return the text values of a category column."""
+        categories = np.array(self.categories[name] + [np.nan], dtype=object)
+        return categories[self.columns[name]]
+
+    def frame(self, columns: List[str] = None) -> pd.DataFrame:
+        """Build a DataFrame of the table, widening compact dtypes back to int64 and float64.
+
+        Args:
+            columns (List[str], optional): The columns to include. Defaults to every column.
+
+        Returns:
+            pd.DataFrame: The table as pd.read_csv would have parsed it.
+        """
+        data = {}
+        for name in (self.columns if columns is None else columns):
+            array = self.columns[name]
+            if name in self.categories:
+                data[name] = pd.Categorical.from_codes(array, self.categories[name]).astype(object)
+            elif array.dtype.kind == 'f':
+                data[name] = array.astype(np.float64)
+            elif array.dtype.kind == 'i':
+                data[name] = array.astype(np.int64)
+            else:
+                data[name] = np.array(array)
+        return pd.DataFrame(data)
+
+
+def load_table(csv_file: str) -> CachedTable:
+    """Load a CSV file through its binary cache, rebuilding the cache if it is stale.
+
+    The cache is keyed on the source file's modification time and size, so editing
+    or replacing the CSV invalidates it automatically.
+
+    Args:
+        csv_file (str): Path to a ';' or ',' delimited CSV file.
+
+    Returns:
+        CachedTable: The memory-mapped columns of the file.
+    """
+    directory = cache_path(csv_file)
+    meta = read_meta(os.path.join(directory, META_FILE))
+    if meta is None or meta['source'] != source_stamp(csv_file):
+        meta = build_cache(csv_file)
+
+    columns = {}
+    categories = {}
+    for column in meta['columns']:
+        columns[column['name']] = np.load(os.path.join(directory, column['file']), mmap_mode='r')
+        if column['categories'] is not None:
+            categories[column['name']] = column['categories']
+
+    return CachedTable(columns, categories)
+
+
+def read_csv(csv_file: str, columns: List[str] = None) -> pd.DataFrame:
+    """A cached drop-in for pd.read_csv on the repo's data files.
+
+    Args:
+        csv_file (str): Path to a ';' or ',' delimited CSV file.
+        columns (List[str], optional): The columns to load. Defaults to every column.
+
+    Returns:
+        pd.DataFrame: The parsed file.
+    """
+    return load_table(csv_file).frame(columns)
+
+
+class ProductIndex:
+    """
+    The rows of each product, and of each day of it, in a multi-product prices file.
+
+    rows is a stable permutation of the file's rows grouped by product and then day,
+    so the rows of a product or of one of its days are the contiguous slice
+    rows[start:stop], still in file order.
+    """
+
+    def __init__(self, rows: np.ndarray, products: Dict[str, dict]):
+        self.rows = rows
+        self.products = products
+
+    def __contains__(self, product: str) -> bool:
+        return product in self.products
+
+    def days(self, product: str) -> List[int]:
+        """Return the days on which a product has rows."""
+        return [int(day) for day in self.products[product]['days']]
+
+    def rows_of(self, product: str, day: int = None) -> np.ndarray:
+        """Return the row numbers of a product, or of one day of it, in file order.
+
+        Raises:
+            KeyError: If the product, or the product on that day, has no rows.
+        """
+        entry = self.products[product]
+        start, stop = entry['range'] if day is None else entry['days'][str(day)]
+        return self.rows[start:stop]
+
+
+def build_index(csv_file: str, table: CachedTable, column: str = 'product') -> dict:
+    """Group the rows of a cached file by product and day and write the index next to its columns.
+
+    Args:
+        csv_file (str): Path to the CSV file.
+        table (CachedTable): The cached columns of the file.
+        column (str): The column naming the product of each row.
+
+    Returns:
+        dict: The metadata of the new index.
+    """
+    directory = cache_path(csv_file)
+    codes = np.asarray(table[column])
+    days = np.asarray(table['day']) if 'day' in table else np.zeros(len(codes), dtype=np.int32)
+
+    # lexsort is stable, so the rows of a product on a day stay in file order
+    rows = np.lexsort((days, codes)).astype(np.int32)
+    sorted_codes, sorted_days = codes[rows], days[rows]
+    boundaries = np.flatnonzero((np.diff(sorted_codes) != 0) | (np.diff(sorted_days) != 0)) + 1
+    starts = np.concatenate(([0], boundaries)).tolist()
+    stops = np.concatenate((boundaries, [len(rows)])).tolist()
+
+    products = {}
+    for start, stop in zip(starts, stops):
+        # Rows without a product sort first under code -1
+        if sorted_codes[start] < 0:
+            continue
+        product = table.categories[column][sorted_codes[start]]
+        entry = products.setdefault(product, {'range': [start, stop], 'days': {}})
+        entry['range'][1] = stop
+        if 'day' in table:
+            entry['days'][str(int(sorted_days[start]))] = [start, stop]
+
+    # Both files are moved into place whole, rows first, so concurrent builds never tear either
+    buffer = io.BytesIO()
+    np.save(buffer, rows)
+    replace_file(os.path.join(directory, ROWS_FILE), buffer.getvalue())
+    meta = {'source': source_stamp(csv_file), 'column': column, 'products': products}
+    replace_file(os.path.join(directory, INDEX_FILE), json.dumps(meta).encode())
+    return meta
+
+
+def product_index(csv_file: str) -> ProductIndex:
+    """Load the product and day index of a prices file, building it on first use or when the file changed.
+
+    Args:
+        csv_file (str): Path to a ';' or ',' delimited prices file with a product column.
+
+    Returns:
+        ProductIndex: The rows of each product and day.
+    """
+    table = load_table(csv_file)
+    directory = cache_path(csv_file)
+    meta = read_meta(os.path.join(directory, INDEX_FILE))
+    if meta is None or meta['source'] != source_stamp(csv_file):
+        meta = build_index(csv_file, table)
+
+    return ProductIndex(np.load(os.path.join(directory, ROWS_FILE), mmap_mode='r'), meta['products'])
+
+
+def load_product(csv_file: str, product: str, day: int = None) -> CachedTable:
+    """Load the rows of one product, or of one day of it, without reading or splitting the whole file.
+
+    Args:
+        csv_file (str): Path to a multi-product prices file.
+        product (str): The product to load.
+        day (int, optional): The day to load. Defaults to every day.
+
+    Returns:
+        CachedTable: The product's rows in file order.
+    """
+    return load_table(csv_file).take(product_index(csv_file).rows_of(product, day))
+
+
+def read_product(csv_file: str, product: str, day: int = None, columns: List[str] = None) -> pd.DataFrame:
+    """A cached drop-in for reading a file split out by product, such as df[df['product'] == product].
+
+    Args:
+        csv_file (str): Path to a multi-product prices file.
+        product (str): The product to read.
+        day (int, optional): The day to read. Defaults to every day.
+        columns (List[str], optional): The columns to load. Defaults to every column.
+
+    Returns:
+        pd.DataFrame: The product's rows in file order, with a fresh index.
+    """
+    return load_product(csv_file, product, day).frame(columns)
@@ -0,0 +1,154 @@
+import numpy as np
+from typing import Dict, List, Sequence
+from datamodel import Symbol, Product, UserId
+
+
+class Slotted:
+    """
+    A base for the classes below, serializing like the datamodel classes they replace.
+
+    TradingState.toJSON() encodes every object through its __dict__, which slotted
+    instances do not have, so __dict__ builds one from the slots that are set.
+    Writing to it does not change the object.
+    """
+
+    __slots__ = ()
+
+    @property
+    def __dict__(self) -> Dict[str, object]:
+        return {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+
+
+class Listing(Slotted):
+    """A Listing with __slots__, taking no per-instance __dict__."""
+
+    __slots__ = ('symbol', 'product', 'denomination')
+
+    def __init__(self, symbol: Symbol, product: Product, denomination: Product):
+        self.symbol = symbol
+        self.product = product
+        self.denomination = denomination
+
+
+class ConversionObservation(Slotted):
+    """A ConversionObservation with __slots__, taking no per-instance __dict__."""
+
+    __slots__ = ('bidPrice', 'askPrice', 'transportFees', 'exportTariff', 'importTariff', 'sunlight', 'humidity')
+
+    def __init__(self, bidPrice: float, askPrice: float, transportFees: float, exportTariff: float, importTariff: float, sunlight: float, humidity: float):
+        self.bidPrice = bidPrice
+        self.askPrice = askPrice
+        self.transportFees = transportFees
+        self.exportTariff = exportTariff
+        self.importTariff = importTariff
+        self.sunlight = sunlight
+        self.humidity = humidity
+
+
+class Order(Slotted):
+    """An Order with __slots__, taking no per-instance __dict__."""
+
+    __slots__ = ('symbol', 'price', 'quantity')
+
+    def __init__(self, symbol: Symbol, price: int, quantity: int) -> None:
+        self.symbol = symbol
+        self.price = price
+        self.quantity = quantity
+
+    def __str__(self) -> str:
+        return "(" + self.symbol + ", " + str(self.price) + ", " + str(self.quantity) + ")"
+
+    def __repr__(self) -> str:
+        return "(" + self.symbol + ", " + str(self.price) + ", " + str(self.quantity) + ")"
+
+
+class OrderDepth(Slotted):
+    """An OrderDepth with __slots__, taking no per-instance __dict__."""
+
+    __slots__ = ('buy_orders', 'sell_orders')
+
+    def __init__(self, buy_orders: Dict[int, int] = None, sell_orders: Dict[int, int] = None):
+        self.buy_orders = {} if buy_orders is None else buy_orders
+        self.sell_orders = {} if sell_orders is None else sell_orders
+
+
+class Trade(Slotted):
+    """A Trade with __slots__, taking no per-instance __dict__."""
+
+    __slots__ = ('symbol', 'price', 'quantity', 'buyer', 'seller', 'timestamp')
+
+    def __init__(self, symbol: Symbol, price: int, quantity: int, buyer: UserId = None, seller: UserId = None, timestamp: int = 0) -> None:
+        self.symbol = symbol
+        self.price = price
+        self.quantity = quantity
+        self.buyer = buyer
+        self.seller = seller
+        self.timestamp = timestamp
+
+    def __str__(self) -> str:
+        return "(" + self.symbol + ", " + self.buyer + " << " + self.seller + ", " + str(self.price) + ", " + str(self.quantity) + ", " + str(self.timestamp) + ")"
+
+    def __repr__(self) -> str:
+        return "(" + self.symbol + ", " + self.buyer + " << " + self.seller + ", " + str(self.price) + ", " + str(self.quantity) + ", " + str(self.timestamp) + ")"
+
+
+class TradeBatch(Sequence):
+    """
+    The trades of one symbol stored as columns, read like a list of Trade objects.
+
+    Prices, quantities and timestamps are arrays and the buyers and sellers are
+    codes into a shared list of names, so a batch costs a few bytes per trade.
+    Indexing or iterating builds each Trade on demand, so code that reads
+    state.market_trades[symbol] works unchanged.
+    """
+
+    def __init__(self, symbol: Symbol, prices: np.ndarray, quantities: np.ndarray, buyers: np.ndarray, sellers: np.ndarray,
+                 timestamps: np.ndarray, names: List[UserId]):
+        """Initialize the batch.
+
+        Args:
+            symbol (str): The symbol every trade is in.
+            prices (np.ndarray): The price of each trade.
+            quantities (np.ndarray): The quantity of each trade.
+            buyers (np.ndarray): The code of each trade's buyer in names.
+            sellers (np.ndarray): The code of each trade's seller in names.
+            timestamps (np.ndarray): The timestamp of each trade.
+            names (List[str]): The trader names the codes refer to.
+        """
+        self.symbol = symbol
+        self.prices = prices
+        self.quantities = quantities
+        self.buyers = buyers
+        self.sellers = sellers
+        self.timestamps = timestamps
+        self.names = names
+
+    @classmethod
+    def from_trades(cls, trades: List[Trade]) -> 'TradeBatch':
+        """Pack a list of trades of one symbol into a batch."""
+        names = sorted({trade.buyer or "" for trade in trades} | {trade.seller or "" for trade in trades})
+        codes = {name: code for code, name in enumerate(names)}
+        return cls(
+            trades[0].symbol if trades else "",
+            np.array([trade.price for trade in trades], dtype=np.float64),
+            np.array([trade.quantity for trade in trades], dtype=np.int32),
+            np.array([codes[trade.buyer or ""] for trade in trades], dtype=np.int16),
+            np.array([codes[trade.seller or ""] for trade in trades], dtype=np.int16),
+            np.array([trade.timestamp for trade in trades], dtype=np.int64),
+            names,
+        )
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return Trade(self.symbol, self.prices[index].item(), int(self.quantities[index]),
+                     self.names[self.buyers[index]], self.names[self.sellers[index]], int(self.timestamps[index]))
+
+    def __iter__(self):
+        names = self.names
+        for price, quantity, buyer, seller, timestamp in zip(self.prices.tolist(), self.quantities.tolist(), self.buyers.tolist(),
+                                                               self.sellers.tolist(), self.timestamps.tolist()):
+            yield Trade(self.symbol, price, quantity, names[buyer], names[seller], timestamp)
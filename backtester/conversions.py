@@ -0,0 +1,123 @@
+import numpy as np
+from typing import List, Tuple
+from datamodel import Observation, Product
+from backtester.compact import ConversionObservation
+from backtester.cache import load_table
+from backtester.replay import PriceReplay
+
+ORCHIDS = "ORCHIDS"
+STORAGE_COST = 0.1
+OBSERVATION_COLUMNS = ('TRANSPORT_FEES', 'EXPORT_TARIFF', 'IMPORT_TARIFF', 'SUNLIGHT', 'HUMIDITY')
+
+
+def align_observations(replay: PriceReplay, csv_files: List[str], product: Product = ORCHIDS) -> dict:
+    """Join the observations of a product onto the ticks of a replay with an as-of lookup.
+
+    Each tick gets the latest observation of the same day at or before its
+    timestamp, found for every tick at once with a single searchsorted. Ticks
+    with no earlier observation that day are NaN.
+
+    Args:
+        replay (PriceReplay): The replay whose ticks the observations are aligned to.
+        csv_files (List[str]): Observations files with a timestamp, DAY and a price column named after the product.
+        product (str): The product the observations are for.
+
+    Returns:
+        dict: One (ticks,) float array per field, named like the ConversionObservation attributes.
+    """
+    tables = [load_table(csv_file) for csv_file in csv_files]
+
+    def column(name, default=None):
+        return np.concatenate([np.asarray(table[name] if name in table else table[default], dtype=np.float64) for table in tables])
+
+    days = np.concatenate([np.asarray(table['DAY'] if 'DAY' in table else np.zeros(len(table)), dtype=np.int64) for table in tables])
+    stamps = np.concatenate([np.asarray(table['timestamp'], dtype=np.int64) for table in tables])
+
+    # Order the observations by (day, timestamp) so both keys can be searched as one
+    order = np.lexsort((stamps, days))
+    days, stamps = days[order], stamps[order]
+    fields = {
+        'bidPrice': column('bidPrice', product)[order],
+        'askPrice': column('askPrice', product)[order],
+    }
+    for name, attribute in zip(OBSERVATION_COLUMNS, ('transportFees', 'exportTariff', 'importTariff', 'sunlight', 'humidity')):
+        fields[attribute] = column(name)[order]
+
+    observation_keys = (days << 32) + stamps
+    tick_keys = (replay.days.astype(np.int64) << 32) + replay.timestamps.astype(np.int64)
+    index = np.searchsorted(observation_keys, tick_keys, side='right') - 1
+    valid = (index >= 0) & (days[np.maximum(index, 0)] == replay.days)
+
+    return {name: np.where(valid, values[np.maximum(index, 0)], np.nan) for name, values in fields.items()}
+
+
+class ConversionEngine:
+    """
+    Executes conversion requests against observations aligned to the replay's ticks.
+
+    As on the exchange, a conversion can only reduce the current position. Covering
+    a short pays the ask price plus transport fees and the import tariff per unit,
+    and selling a long receives the bid price minus transport fees and the export
+    tariff. Long positions are charged a storage cost every tick they are held.
+    """
+
+    def __init__(self, replay: PriceReplay, csv_files: List[str], product: Product = ORCHIDS, storage_cost: float = STORAGE_COST):
+        """Initialize the engine with the observations of a product.
+
+        Args:
+            replay (PriceReplay): The replay being backtested.
+            csv_files (List[str]): The observations files of the product.
+            product (str): The product conversions are requested for.
+            storage_cost (float): The cost per unit per tick of holding a long position.
+        """
+        self.product = product
+        self.storage_cost = storage_cost
+        self.observations = align_observations(replay, csv_files, product)
+        self.rejected_conversions = 0
+
+    def observation(self, tick: int) -> Observation:
+        """Build the Observation of a tick.
+
+        Args:
+            tick (int): The tick index.
+
+        Returns:
+            Observation: The tick's conversion observation, empty if none has been seen yet that day.
+        """
+        values = {name: float(array[tick]) for name, array in self.observations.items()}
+        if values['bidPrice'] != values['bidPrice']:
+            return Observation({}, {})
+        return Observation({}, {self.product: ConversionObservation(**values)})
+
+    def convert(self, tick: int, request: int, position: int) -> Tuple[int, float]:
+        """Execute a conversion request.
+
+        Args:
+            tick (int): The tick the request was made on.
+            request (int): The requested conversion, positive to buy and negative to sell.
+            position (int): The current position in the product.
+
+        Returns:
+            Tuple[int, float]: The converted quantity and its price per unit including fees and tariffs,
+            or (0, 0.0) if the request was rejected.
+        """
+        if not request:
+            return 0, 0.0
+
+        bid_price = self.observations['bidPrice'][tick]
+        closes_position = (request > 0 and position < 0) or (request < 0 and position > 0)
+        if bid_price != bid_price or not closes_position or abs(request) > abs(position):
+            self.rejected_conversions += 1
+            return 0, 0.0
+
+        transport_fees = self.observations['transportFees'][tick]
+        if request > 0:
+            price = self.observations['askPrice'][tick] + transport_fees + self.observations['importTariff'][tick]
+        else:
+            price = bid_price - transport_fees - self.observations['exportTariff'][tick]
+
+        return request, float(price)
+
+    def storage(self, position: int) -> float:
+        """Return the storage cost of holding a position for one tick."""
+        return self.storage_cost * position if position > 0 else 0.0
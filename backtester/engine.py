@@ -0,0 +1,143 @@
+import numpy as np
+from typing import Dict
+from datamodel import Product
+from backtester.replay import PriceReplay
+from backtester.matching import MatchingEngine, SUBMISSION
+from backtester.ledger import Ledger
+from backtester.conversions import ConversionEngine
+from backtester.profiler import LatencyProfiler
+from backtester.recording import StateWriter
+
+
+class BacktestResult:
+    """
+    The per-tick PnL and position series of one backtest.
+
+    Attributes:
+        products (List[str]): The products in column order.
+        days (np.ndarray): The day of each tick.
+        timestamps (np.ndarray): The timestamp of each tick.
+        pnl (np.ndarray): Marked PnL per tick and product.
+        positions (np.ndarray): Position per tick and product, after the tick's fills.
+        realized (np.ndarray): Realized PnL per tick and product.
+        turnover (np.ndarray): Total filled quantity per product.
+        conversion_pnl (np.ndarray): The part of the realized PnL from conversions and storage, per tick and product.
+    """
+
+    def __init__(self, products, days, timestamps, pnl, positions, realized, turnover, conversion_pnl=None):
+        self.products = products
+        self.days = days
+        self.timestamps = timestamps
+        self.pnl = pnl
+        self.positions = positions
+        self.realized = realized
+        self.turnover = turnover
+        self.conversion_pnl = np.zeros_like(pnl) if conversion_pnl is None else conversion_pnl
+
+    def total_pnl(self) -> np.ndarray:
+        """Return the PnL summed over every product at each tick."""
+        return self.pnl.sum(axis=1)
+
+    def max_drawdown(self) -> float:
+        """Return the largest peak-to-trough fall of the total PnL."""
+        total = self.total_pnl()
+        if len(total) == 0:
+            return 0.0
+        return float(np.max(np.maximum.accumulate(total) - total))
+
+    def summary(self) -> Dict[str, float]:
+        """Summarize the backtest by final PnL, maximum drawdown and turnover.
+
+        Returns:
+            Dict[str, float]: The total and per-product final PnL, the max drawdown and the total turnover.
+        """
+        final_pnl = self.pnl[-1] if len(self.pnl) else np.zeros(len(self.products))
+        summary = {
+            'pnl': float(final_pnl.sum()),
+            'realized_pnl': float(self.realized[-1].sum()) if len(self.realized) else 0.0,
+            'conversion_pnl': float(self.conversion_pnl[-1].sum()) if len(self.conversion_pnl) else 0.0,
+            'max_drawdown': self.max_drawdown(),
+            'turnover': int(self.turnover.sum()),
+        }
+        for code, product in enumerate(self.products):
+            summary[f'{product}_pnl'] = float(final_pnl[code])
+        return summary
+
+
+class Backtest:
+    """
+    Replays a prices file through a Trader, filling its orders with the MatchingEngine.
+
+    Fills are booked in a Ledger, which marks the positions of every tick at the
+    chosen mark, carried forward across ticks where the product has no book. With a
+    ConversionEngine, the trader's conversion requests are executed against its
+    observations and the storage cost of long positions is charged every tick.
+    With a LatencyProfiler, every run call and strategy of the trader is timed, and
+    with a StateWriter, every state is recorded along with the trader's response.
+    """
+
+    def __init__(self, trader, replay: PriceReplay, position_limits: Dict[Product, int] = None, mark: str = 'mid',
+                 conversions: ConversionEngine = None, profiler: LatencyProfiler = None,
+                 recorder: StateWriter = None):
+        """Initialize the backtest.
+
+        Args:
+            trader: An object with a run(state) method returning (orders, conversions, trader_data).
+            replay (PriceReplay): The market data to replay.
+            position_limits (Dict[str, int], optional): Position limit per product. Defaults to the exchange limits.
+            mark (str): How positions are marked, one of 'mid', 'best' or 'vwap'.
+            conversions (ConversionEngine, optional): Executes conversion requests. Defaults to ignoring them.
+            profiler (LatencyProfiler, optional): Times the trader. Defaults to no profiling.
+            recorder (StateWriter, optional): Records every tick. Defaults to no recording.
+        """
+        self.trader = trader
+        self.replay = replay
+        self.engine = MatchingEngine(replay, position_limits)
+        self.ledger = Ledger.for_replay(replay, mark)
+        self.conversions = conversions
+        self.profiler = profiler
+        self.recorder = recorder
+        if profiler is not None:
+            profiler.attach(trader)
+
+    def run(self) -> BacktestResult:
+        """Run the trader over every tick of the replay.
+
+        Returns:
+            BacktestResult: The PnL and position series of the run.
+        """
+        replay = self.replay
+        ledger = self.ledger
+        converter = self.conversions
+        recorder = self.recorder
+
+        position = {product: 0 for product in replay.products}
+        own_trades = {}
+        trader_data = ""
+
+        for tick, state in enumerate(replay.states(position)):
+            state.own_trades = own_trades
+            state.traderData = trader_data
+            if converter is not None:
+                state.observations = converter.observation(tick)
+
+            orders, conversions, trader_data = self.trader.run(state)
+            if recorder is not None:
+                recorder.write(state, orders, conversions, trader_data)
+            own_trades = self.engine.match(tick, orders, position, state.market_trades)
+
+            for symbol, trades in own_trades.items():
+                for trade in trades:
+                    ledger.fill(symbol, trade.price, trade.quantity if trade.buyer == SUBMISSION else -trade.quantity)
+
+            if converter is not None and converter.product in position:
+                quantity, price = converter.convert(tick, conversions, position[converter.product])
+                if quantity:
+                    ledger.convert(converter.product, price, quantity)
+                    position[converter.product] += quantity
+                ledger.charge(converter.product, converter.storage(position[converter.product]))
+
+            ledger.mark(tick)
+
+        return BacktestResult(replay.products, replay.days, replay.timestamps, ledger.pnl, ledger.positions, ledger.realized, ledger.turnover,
+                              ledger.conversion_pnl)
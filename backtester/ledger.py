@@ -0,0 +1,201 @@
+import numpy as np
+from typing import List, Tuple
+from datamodel import Product
+from backtester.replay import PriceReplay
+
+MARK_METHODS = ('mid', 'best', 'vwap')
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Carry the last non-NaN value of each column forward, with 0 before the first one.
+
+    Args:
+        values (np.ndarray): A (ticks, products) array with NaN gaps.
+
+    Returns:
+        np.ndarray: The filled array.
+    """
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    filled = np.take_along_axis(values, index, axis=0)
+    return np.where(np.isnan(filled), 0.0, filled)
+
+
+def mark_prices(replay: PriceReplay, method: str = 'mid') -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the prices long and short positions are marked at on every tick.
+
+    'mid' marks both sides at the midpoint of the best bid and ask, 'best' marks
+    longs at the best bid and shorts at the best ask, and 'vwap' marks both sides
+    at the volume-weighted price of every level in the book.
+
+    Args:
+        replay (PriceReplay): The replay to mark against.
+        method (str): One of MARK_METHODS.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The (ticks, products) marks for long and for short positions.
+    """
+    if method not in MARK_METHODS:
+        raise ValueError(f"Unknown mark method {method}, expected one of {MARK_METHODS}")
+
+    # A book side with no volume at its first level has no best price
+    best_bid = np.where(replay.bid_volumes[:, :, 0] > 0, replay.bid_prices[:, :, 0], np.nan)
+    best_ask = np.where(replay.ask_volumes[:, :, 0] > 0, replay.ask_prices[:, :, 0], np.nan)
+
+    if method == 'best':
+        return forward_fill(best_bid), forward_fill(best_ask)
+
+    if method == 'mid':
+        mid = forward_fill((best_bid + best_ask) / 2)
+        return mid, mid
+
+    notional = (replay.bid_prices * replay.bid_volumes).sum(axis=2) + (replay.ask_prices * replay.ask_volumes).sum(axis=2)
+    volume = replay.bid_volumes.sum(axis=2) + replay.ask_volumes.sum(axis=2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vwap = forward_fill(np.where(volume > 0, notional / volume, np.nan))
+    return vwap, vwap
+
+
+class Ledger:
+    """
+    Running cash, position, average entry price and PnL per product.
+
+    Each fill and each tick's mark is O(1) per product, and the marked PnL,
+    realized PnL and positions of every tick are written into preallocated arrays.
+
+    Attributes:
+        products (List[str]): The products in column order.
+        pnl (np.ndarray): Total marked PnL per tick and product.
+        realized (np.ndarray): Realized PnL per tick and product.
+        conversion_pnl (np.ndarray): The part of the realized PnL from conversions and storage, per tick and product.
+        positions (np.ndarray): Position per tick and product.
+        turnover (np.ndarray): Total filled quantity per product.
+    """
+
+    def __init__(self, products: List[Product], long_marks: np.ndarray, short_marks: np.ndarray):
+        """Initialize a flat ledger.
+
+        Args:
+            products (List[str]): The products in column order.
+            long_marks (np.ndarray): The (ticks, products) prices long positions are marked at.
+            short_marks (np.ndarray): The (ticks, products) prices short positions are marked at.
+        """
+        self.products = products
+        self.codes = {product: code for code, product in enumerate(products)}
+        self.long_marks = long_marks
+        self.short_marks = short_marks
+
+        self.cash = [0.0] * len(products)
+        self.position = [0] * len(products)
+        self.average_price = [0.0] * len(products)
+        self.realized_pnl = [0.0] * len(products)
+        self.converted_pnl = [0.0] * len(products)
+
+        shape = (len(long_marks), len(products))
+        self.pnl = np.zeros(shape)
+        self.realized = np.zeros(shape)
+        self.conversion_pnl = np.zeros(shape)
+        self.positions = np.zeros(shape, dtype=np.int64)
+        self.turnover = np.zeros(len(products), dtype=np.int64)
+
+    @classmethod
+    def for_replay(cls, replay: PriceReplay, mark: str = 'mid') -> 'Ledger':
+        """Create a ledger marked against a replay's books.
+
+        Args:
+            replay (PriceReplay): The replay to mark against.
+            mark (str): One of MARK_METHODS.
+
+        Returns:
+            Ledger: A flat ledger over the replay's products and ticks.
+        """
+        return cls(replay.products, *mark_prices(replay, mark))
+
+    def fill(self, product: Product, price: float, quantity: int) -> float:
+        """Book a fill, positive quantities being buys.
+
+        Args:
+            product (str): The product traded.
+            price (float): The fill price.
+            quantity (int): The signed fill quantity.
+
+        Returns:
+            float: The PnL realized by the fill.
+        """
+        code = self.codes[product]
+        position = self.position[code]
+        realized = 0.0
+
+        self.cash[code] -= price * quantity
+        self.turnover[code] += abs(quantity)
+
+        if position == 0 or (position > 0) == (quantity > 0):
+            # Adding to the position moves the average entry price
+            self.average_price[code] = (self.average_price[code] * abs(position) + price * abs(quantity)) / (abs(position) + abs(quantity))
+        else:
+            # Reducing the position realizes PnL on the closed quantity
+            closed = min(abs(quantity), abs(position))
+            direction = 1 if position > 0 else -1
+            realized = (price - self.average_price[code]) * closed * direction
+            self.realized_pnl[code] += realized
+
+            if abs(quantity) > abs(position):
+                self.average_price[code] = price
+            elif abs(quantity) == abs(position):
+                self.average_price[code] = 0.0
+
+        self.position[code] = position + quantity
+        return realized
+
+    def convert(self, product: Product, price: float, quantity: int) -> None:
+        """Book a conversion, attributing the PnL it realizes to conversions.
+
+        Args:
+            product (str): The product converted.
+            price (float): The conversion price per unit, including fees and tariffs.
+            quantity (int): The signed converted quantity.
+        """
+        self.converted_pnl[self.codes[product]] += self.fill(product, price, quantity)
+
+    def charge(self, product: Product, amount: float) -> None:
+        """Book a cost such as storage against a product's conversion PnL.
+
+        Args:
+            product (str): The product the cost is charged to.
+            amount (float): The cost.
+        """
+        code = self.codes[product]
+        self.cash[code] -= amount
+        self.realized_pnl[code] -= amount
+        self.converted_pnl[code] -= amount
+
+    def mark(self, tick: int) -> None:
+        """Mark every position at the tick's prices and record the tick.
+
+        Args:
+            tick (int): The tick index.
+        """
+        long_marks = self.long_marks[tick].tolist()
+        short_marks = self.short_marks[tick].tolist()
+
+        self.pnl[tick] = [cash + position * (long_mark if position > 0 else short_mark)
+                          for cash, position, long_mark, short_mark in zip(self.cash, self.position, long_marks, short_marks)]
+        self.realized[tick] = self.realized_pnl
+        self.conversion_pnl[tick] = self.converted_pnl
+        self.positions[tick] = self.position
+
+    def unrealized_pnl(self, product: Product, tick: int) -> float:
+        """Return the unrealized PnL of a product's open position at a tick.
+
+        Args:
+            product (str): The product.
+            tick (int): The tick index.
+
+        Returns:
+            float: The marked value of the position above its average entry price.
+        """
+        code = self.codes[product]
+        position = self.position[code]
+        price = self.long_marks[tick, code] if position > 0 else self.short_marks[tick, code]
+        return (price - self.average_price[code]) * position
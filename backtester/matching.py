@@ -0,0 +1,163 @@
+from bisect import bisect_right
+from typing import Dict, List
+from datamodel import Order, Symbol, Product, Position
+from backtester.compact import Trade
+from backtester.replay import PriceReplay
+
+SUBMISSION = "SUBMISSION"
+
+POSITION_LIMITS = {
+    "AMETHYSTS": 20,
+    "STARFRUIT": 20,
+    "ORCHIDS": 100,
+    "CHOCOLATE": 250,
+    "STRAWBERRIES": 350,
+    "ROSES": 60,
+    "GIFT_BASKET": 60,
+    "COCONUT": 300,
+    "COCONUT_COUPON": 600,
+}
+
+
+class MatchingEngine:
+    """
+    A price-level matching engine that fills a tick's orders the way the exchange does.
+
+    Orders are first crossed against the order book levels of the tick, best price
+    first, and then against the tick's market trades. Each print can fill its quantity
+    of buy orders, taking its seller's side, and separately its quantity of sell orders,
+    taking its buyer's side. Whatever is left unfilled is cancelled at the end of the tick. If the aggregate buy or sell quantity of a
+    product could breach its position limit, all of that product's orders are rejected.
+
+    The books are read as sorted price arrays straight from the PriceReplay, so
+    crossing an order is a bisect plus a walk over the levels it actually takes.
+    """
+
+    def __init__(self, replay: PriceReplay, position_limits: Dict[Product, int] = None):
+        """Initialize the matching engine over a replay.
+
+        Args:
+            replay (PriceReplay): The replay whose books the orders are matched against.
+            position_limits (Dict[str, int], optional): Position limit per product. Defaults to POSITION_LIMITS.
+        """
+        self.replay = replay
+        self.position_limits = POSITION_LIMITS if position_limits is None else position_limits
+        self.product_codes = {product: code for code, product in enumerate(replay.products)}
+        self.rejected_orders = 0
+
+    def within_limits(self, product: Product, orders: List[Order], position: int) -> bool:
+        """Check whether a product's orders could breach its position limit if all filled.
+
+        Args:
+            product (str): The product the orders are for.
+            orders (List[Order]): The orders submitted for the product this tick.
+            position (int): The current position in the product.
+
+        Returns:
+            bool: False if the exchange would reject all of the product's orders.
+        """
+        limit = self.position_limits.get(product)
+        if limit is None:
+            return True
+
+        buy_quantity = sum(order.quantity for order in orders if order.quantity > 0)
+        sell_quantity = sum(order.quantity for order in orders if order.quantity < 0)
+        return position + buy_quantity <= limit and position + sell_quantity >= -limit
+
+    def match(self, tick: int, orders: Dict[Symbol, List[Order]], position: Dict[Product, Position],
+              market_trades: Dict[Symbol, List[Trade]] = None) -> Dict[Symbol, List[Trade]]:
+        """Match one tick of orders and update the positions in place.
+
+        Args:
+            tick (int): The replay tick the orders were submitted on.
+            orders (Dict[str, List[Order]]): The orders returned by Trader.run.
+            position (Dict[str, int]): The running positions, updated with every fill.
+            market_trades (Dict[str, List[Trade]], optional): The market trades of the tick.
+
+        Returns:
+            Dict[str, List[Trade]]: The own trades of the tick per product.
+        """
+        timestamp = int(self.replay.timestamps[tick])
+        own_trades = {}
+
+        for symbol, symbol_orders in orders.items():
+            code = self.product_codes.get(symbol)
+            if not symbol_orders or code is None or not self.replay.present[tick, code]:
+                continue
+
+            current_position = position.get(symbol, 0)
+            if not self.within_limits(symbol, symbol_orders, current_position):
+                self.rejected_orders += len(symbol_orders)
+                continue
+
+            # Copy the levels of this book, since fills consume their volume
+            bid_prices = self.replay.bid_prices[tick, code].tolist()
+            bid_volumes = self.replay.bid_volumes[tick, code].tolist()
+            ask_prices = self.replay.ask_prices[tick, code].tolist()
+            ask_volumes = self.replay.ask_volumes[tick, code].tolist()
+
+            # Empty levels are stored last with a volume of 0, so trim them off
+            bid_levels = bid_volumes.index(0) if 0 in bid_volumes else len(bid_volumes)
+            ask_levels = ask_volumes.index(0) if 0 in ask_volumes else len(ask_volumes)
+            negated_bid_prices = [-price for price in bid_prices[:bid_levels]]
+            ask_prices = ask_prices[:ask_levels]
+
+            # A buy takes a print's sell side and a sell its buy side, so each side has its own volume left
+            trades = market_trades.get(symbol, []) if market_trades else []
+            sell_volumes = [trade.quantity for trade in trades]
+            buy_volumes = list(sell_volumes)
+
+            fills = []
+            for order in symbol_orders:
+                remaining = int(order.quantity)
+
+                if remaining > 0:
+                    # Buy orders take the asks priced at or below the order, cheapest first
+                    for level in range(bisect_right(ask_prices, order.price)):
+                        volume = min(remaining, ask_volumes[level])
+                        if volume:
+                            ask_volumes[level] -= volume
+                            remaining -= volume
+                            fills.append(Trade(symbol, ask_prices[level], volume, SUBMISSION, "", timestamp))
+                        if not remaining:
+                            break
+
+                    for index, trade in enumerate(trades):
+                        if not remaining:
+                            break
+                        if trade.price <= order.price and sell_volumes[index]:
+                            volume = min(remaining, sell_volumes[index])
+                            sell_volumes[index] -= volume
+                            remaining -= volume
+                            fills.append(Trade(symbol, order.price, volume, SUBMISSION, trade.seller or "", timestamp))
+
+                    current_position += int(order.quantity) - remaining
+
+                elif remaining < 0:
+                    # Sell orders hit the bids priced at or above the order, highest first
+                    for level in range(bisect_right(negated_bid_prices, -order.price)):
+                        volume = min(-remaining, bid_volumes[level])
+                        if volume:
+                            bid_volumes[level] -= volume
+                            remaining += volume
+                            fills.append(Trade(symbol, bid_prices[level], volume, "", SUBMISSION, timestamp))
+                        if not remaining:
+                            break
+
+                    for index, trade in enumerate(trades):
+                        if not remaining:
+                            break
+                        if trade.price >= order.price and buy_volumes[index]:
+                            volume = min(-remaining, buy_volumes[index])
+                            buy_volumes[index] -= volume
+                            remaining += volume
+                            fills.append(Trade(symbol, order.price, volume, trade.buyer or "", SUBMISSION, timestamp))
+
+                    current_position += int(order.quantity) - remaining
+
+            # Any unfilled remainder is cancelled at the end of the tick
+            position[symbol] = current_position
+            if fills:
+                own_trades[symbol] = fills
+
+        return own_trades
@@ -0,0 +1,113 @@
+import importlib
+import numpy as np
+import pandas as pd
+from contextlib import ExitStack
+from multiprocessing import Pool
+from typing import List, Tuple
+from datamodel import Product
+from backtester.replay import PriceReplay
+from backtester.shared import SharedReplay, attach_replay
+from backtester.engine import Backtest, BacktestResult
+
+# Per-worker state, set once by the pool initializer
+_worker_replays = None
+_worker_trader_class = None
+
+
+class MultiDayResult:
+    """
+    The merged results of backtesting several days, one BacktestResult per day.
+
+    Attributes:
+        runs (List[Tuple[str, int, BacktestResult]]): The source file, day and result of each run, in order.
+    """
+
+    def __init__(self, runs: List[Tuple[str, int, BacktestResult]]):
+        self.runs = runs
+
+    def series(self) -> pd.DataFrame:
+        """Merge the per-tick PnL and position series of every day into one table.
+
+        Returns:
+            pd.DataFrame: One row per tick with the file, day, timestamp and the PnL and position of each product.
+        """
+        frames = []
+        for csv_file, day, result in self.runs:
+            frame = pd.DataFrame({'file': csv_file, 'day': day, 'timestamp': result.timestamps})
+            for code, product in enumerate(result.products):
+                frame[f'{product}_pnl'] = result.pnl[:, code]
+                frame[f'{product}_position'] = result.positions[:, code]
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True)
+
+    def summary(self) -> pd.DataFrame:
+        """Summarize each day and the aggregate over all days.
+
+        The aggregate PnL and turnover are sums over the days, and its drawdown is
+        taken over the days' PnL curves chained end to end.
+
+        Returns:
+            pd.DataFrame: One row per day followed by a 'total' row.
+        """
+        rows = [{'file': csv_file, 'day': day, **result.summary()} for csv_file, day, result in self.runs]
+
+        # Chain the daily PnL curves so each day starts from the previous day's close
+        offset = 0.0
+        chained = []
+        for _, _, result in self.runs:
+            total = result.total_pnl()
+            chained.append(total + offset)
+            if len(total):
+                offset += total[-1]
+        chained = np.concatenate(chained) if chained else np.zeros(0)
+        drawdown = float(np.max(np.maximum.accumulate(chained) - chained)) if len(chained) else 0.0
+
+        summary = pd.DataFrame(rows)
+        total = summary.drop(columns=['file', 'day', 'max_drawdown']).sum(numeric_only=True)
+        total['max_drawdown'] = drawdown
+        total['file'] = 'total'
+        summary.loc[len(summary)] = total
+        return summary
+
+
+def _init_worker(handles: List[dict], trader_module: str) -> None:
+    global _worker_replays, _worker_trader_class
+    _worker_replays = [attach_replay(handle) for handle in handles]
+    _worker_trader_class = importlib.import_module(trader_module).Trader
+
+
+def _run_day(task: Tuple[int, int]) -> Tuple[int, int, BacktestResult]:
+    index, day = task
+    replay = _worker_replays[index].select_day(day)
+
+    # The exchange starts every day from a new Trader with flat positions
+    return index, day, Backtest(_worker_trader_class(), replay).run()
+
+
+def backtest_days(csv_files: List[str], days: List[int] = None, products: List[Product] = None,
+                  processes: int = None, trader_module: str = 'trader') -> MultiDayResult:
+    """Backtest every day of several prices files, one day per worker process.
+
+    Each file is parsed once and published in shared memory. Every day then runs
+    on its own worker with a fresh Trader and flat positions, as on the exchange,
+    so a multi-day validation takes roughly the wall time of its slowest day.
+
+    Args:
+        csv_files (List[str]): The prices files to backtest.
+        days (List[int], optional): Only backtest these days. Defaults to every day in each file.
+        products (List[str], optional): The products to replay. Defaults to every product in each file.
+        processes (int, optional): The number of worker processes. Defaults to the number of cores.
+        trader_module (str): The module the Trader class is imported from.
+
+    Returns:
+        MultiDayResult: The results of every day, ordered by file and day.
+    """
+    replays = [PriceReplay(csv_file, products) for csv_file in csv_files]
+    tasks = [(index, day) for index, replay in enumerate(replays) for day in replay.day_numbers() if days is None or day in days]
+
+    with ExitStack() as stack:
+        handles = [stack.enter_context(SharedReplay(replay)).handle for replay in replays]
+        with Pool(processes, initializer=_init_worker, initargs=(handles, trader_module)) as pool:
+            results = pool.map(_run_day, tasks, chunksize=1)
+
+    return MultiDayResult([(csv_files[index], day, result) for index, day, result in results])
@@ -0,0 +1,106 @@
+import functools
+import numpy as np
+import pandas as pd
+from time import perf_counter_ns
+from typing import Dict, List
+
+# The exchange's time limit for a single Trader.run call
+TIME_BUDGET_NS = 900_000_000
+PERCENTILES = (50, 95, 99)
+STRATEGIES = (
+    'generate_starfruit_orders',
+    'generate_amethyst_orders',
+    'generate_orchid_orders',
+    'round_3_trades',
+    'generate_coconut_coupon_orders',
+    'load_trader_data',
+    'dump_trader_data',
+)
+RUN = 'run'
+
+
+class LatencyProfiler:
+    """
+    Times Trader.run and each strategy it calls with perf_counter_ns.
+
+    Profiling is opt-in: attach() shadows the trader's methods with timed wrappers
+    on that instance only, so an unprofiled trader runs its methods untouched. Every
+    call of a method appends its latency in nanoseconds to that method's samples, and
+    every run call over the time budget is counted as an overrun.
+    """
+
+    def __init__(self, budget_ns: int = TIME_BUDGET_NS, strategies: List[str] = STRATEGIES):
+        """Initialize the profiler.
+
+        Args:
+            budget_ns (int): The per-tick time budget of a run call, in nanoseconds.
+            strategies (List[str]): The Trader methods to time individually.
+        """
+        self.budget_ns = budget_ns
+        self.strategies = strategies
+        self.samples: Dict[str, List[int]] = {}
+        self.overruns = 0
+
+    def attach(self, trader) -> None:
+        """Wrap the run method and the strategies of a Trader instance with timers.
+
+        Args:
+            trader: The Trader to profile. Strategies it does not define are skipped.
+        """
+        for name in self.strategies:
+            if hasattr(trader, name):
+                setattr(trader, name, self.timed(name, getattr(trader, name)))
+
+        run = self.timed(RUN, trader.run)
+        samples = self.samples[RUN]
+
+        @functools.wraps(run)
+        def budgeted_run(state):
+            result = run(state)
+            if samples[-1] > self.budget_ns:
+                self.overruns += 1
+            return result
+
+        trader.run = budgeted_run
+
+    def timed(self, name: str, method):
+        """Return a wrapper of a bound method that records the latency of every call."""
+        samples = self.samples.setdefault(name, [])
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = perf_counter_ns()
+            result = method(*args, **kwargs)
+            samples.append(perf_counter_ns() - start)
+            return result
+
+        return wrapper
+
+    def summary(self) -> pd.DataFrame:
+        """Summarize the latency histogram of every timed method.
+
+        Returns:
+            pd.DataFrame: Per method, the call count, mean, p50, p95, p99 and max in
+            microseconds, the percentage of the total run time, and the calls over the budget.
+        """
+        run_total = sum(self.samples.get(RUN, ())) or 1
+        rows = []
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            values = np.array(samples, dtype=np.int64)
+            row = {'method': name, 'calls': len(values), 'mean_us': values.mean() / 1000}
+            for percentile, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+                row[f'p{percentile}_us'] = value / 1000
+            row['max_us'] = values.max() / 1000
+            row['run_pct'] = 100 * values.sum() / run_total
+            row['over_budget'] = int((values > self.budget_ns).sum())
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def report(self) -> str:
+        """Format the summary and the overrun count for printing after a backtest."""
+        table = self.summary()
+        calls = len(self.samples.get(RUN, ()))
+        header = f"{calls} ticks, {self.overruns} over the {self.budget_ns / 1e6:g} ms budget"
+        return header + "\n" + (table.to_string(index=False, float_format='{:.1f}'.format) if len(table) else "")
@@ -0,0 +1,121 @@
+import json
+from typing import Dict, Iterator, List, Tuple
+from datamodel import ConversionObservation, Listing, Observation, Order, OrderDepth, Trade, TradingState, Symbol
+
+# A record is one JSON array per line, with the fields of a tick in this order
+FIELDS = ('timestamp', 'traderData', 'listings', 'order_depths', 'own_trades', 'market_trades', 'position',
+          'plain_observations', 'conversion_observations', 'orders', 'conversions', 'trader_data')
+
+_encoder = json.JSONEncoder(separators=(',', ':'), check_circular=False)
+
+
+def _encode_trades(trades: Dict[Symbol, List[Trade]]) -> dict:
+    return {symbol: [(t.price, t.quantity, t.buyer, t.seller, t.timestamp) for t in symbol_trades] for symbol, symbol_trades in trades.items()}
+
+
+def _decode_trades(trades: dict) -> Dict[Symbol, List[Trade]]:
+    return {symbol: [Trade(symbol, *values) for values in symbol_trades] for symbol, symbol_trades in trades.items()}
+
+
+def encode(state: TradingState, orders: Dict[Symbol, List[Order]] = None, conversions: int = 0, trader_data: str = "") -> str:
+    """Encode a TradingState and the trader's response as one line.
+
+    Each object is written as a positional array instead of a dict of its
+    attributes, and order book levels as [price, volume] pairs so their integer
+    prices survive the round trip.
+
+    Args:
+        state (TradingState): The state passed to Trader.run.
+        orders (Dict[str, List[Order]], optional): The orders returned by Trader.run.
+        conversions (int): The conversions returned by Trader.run.
+        trader_data (str): The traderData returned by Trader.run.
+
+    Returns:
+        str: The record, without a trailing newline.
+    """
+    observations = state.observations
+    return _encoder.encode((
+        state.timestamp,
+        state.traderData,
+        [(listing.symbol, listing.product, listing.denomination) for listing in state.listings.values()],
+        {symbol: ([*depth.buy_orders.items()], [*depth.sell_orders.items()]) for symbol, depth in state.order_depths.items()},
+        _encode_trades(state.own_trades),
+        _encode_trades(state.market_trades),
+        state.position,
+        observations.plainValueObservations,
+        {product: (o.bidPrice, o.askPrice, o.transportFees, o.exportTariff, o.importTariff, o.sunlight, o.humidity)
+         for product, o in observations.conversionObservations.items()},
+        {symbol: [(order.price, order.quantity) for order in symbol_orders] for symbol, symbol_orders in (orders or {}).items()},
+        conversions,
+        trader_data,
+    ))
+
+
+def decode(line: str) -> Tuple[TradingState, Dict[Symbol, List[Order]], int, str]:
+    """Decode a record back into datamodel objects.
+
+    Args:
+        line (str): A record written by encode.
+
+    Returns:
+        Tuple[TradingState, Dict[str, List[Order]], int, str]: The state and the orders, conversions and traderData returned for it.
+    """
+    (timestamp, trader_data_in, listings, order_depths, own_trades, market_trades, position,
+     plain_observations, conversion_observations, orders, conversions, trader_data) = json.loads(line)
+
+    state = TradingState(
+        trader_data_in,
+        timestamp,
+        {symbol: Listing(symbol, product, denomination) for symbol, product, denomination in listings},
+        {symbol: OrderDepth(dict(buy_orders), dict(sell_orders)) for symbol, (buy_orders, sell_orders) in order_depths.items()},
+        _decode_trades(own_trades),
+        _decode_trades(market_trades),
+        position,
+        Observation(plain_observations, {product: ConversionObservation(*values) for product, values in conversion_observations.items()}),
+    )
+    orders = {symbol: [Order(symbol, price, quantity) for price, quantity in symbol_orders] for symbol, symbol_orders in orders.items()}
+    return state, orders, conversions, trader_data
+
+
+class StateWriter:
+    """
+    Streams records of TradingStates to a file, one line per tick.
+
+    Lines are written through the file's buffer, so recording a whole day costs
+    little more than encoding it. Use as a context manager, or close() when done.
+    """
+
+    def __init__(self, path: str):
+        """Open the recording file, replacing any existing one."""
+        self.path = path
+        self.file = open(path, 'w', buffering=1 << 20)
+        self.records = 0
+
+    def write(self, state: TradingState, orders: Dict[Symbol, List[Order]] = None, conversions: int = 0, trader_data: str = "") -> None:
+        """Append a state and the trader's response. See encode."""
+        self.file.write(encode(state, orders, conversions, trader_data))
+        self.file.write('\n')
+        self.records += 1
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> 'StateWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_records(path: str) -> Iterator[Tuple[TradingState, Dict[Symbol, List[Order]], int, str]]:
+    """Lazily decode the records of a recording file.
+
+    Args:
+        path (str): A file written by StateWriter.
+
+    Yields:
+        Tuple[TradingState, Dict[str, List[Order]], int, str]: The state and the trader's response of each tick.
+    """
+    with open(path, 'r') as file:
+        for line in file:
+            yield decode(line)
@@ -0,0 +1,171 @@
+import numpy as np
+from typing import Dict, Iterator, List
+from datamodel import Observation, TradingState, Product, Position
+from backtester.compact import Listing, OrderDepth
+from backtester.cache import read_csv
+
+SEASHELLS = "SEASHELLS"
+LEVELS = 3
+ARRAY_FIELDS = ('days', 'timestamps', 'present', 'bid_prices', 'bid_volumes', 'ask_prices', 'ask_volumes', 'mid_prices')
+
+
+class PriceReplay:
+    """
+    A columnar replay of an order book prices file.
+
+    The file is parsed once into NumPy arrays of shape (ticks, products, levels),
+    where a tick is a unique (day, timestamp) pair. Each TradingState is then
+    built straight from the array slices of its tick, for any set of products.
+
+    Attributes:
+        products (List[str]): The replayed products, in column order.
+        days (np.ndarray): The day of each tick.
+        timestamps (np.ndarray): The timestamp of each tick.
+        present (np.ndarray): Whether each product has a book at each tick.
+        bid_prices, bid_volumes, ask_prices, ask_volumes (np.ndarray): Book levels,
+            with a volume of 0 marking an empty level.
+        mid_prices (np.ndarray): The mid price reported in the file.
+    """
+
+    def __init__(self, csv_file: str, products: List[Product] = None):
+        """Load a prices file into columnar arrays.
+
+        Args:
+            csv_file (str): Path to a prices CSV in either delimiter layout.
+            products (List[str], optional): The products to replay. Defaults to every product in the file.
+        """
+        df = read_csv(csv_file)
+        if products is not None:
+            df = df[df['product'].isin(products)]
+            self.products = [product for product in products if product in set(df['product'])]
+        else:
+            self.products = sorted(df['product'].unique())
+
+        product_codes = {product: code for code, product in enumerate(self.products)}
+        codes = df['product'].map(product_codes).to_numpy()
+
+        days = df['day'].to_numpy(np.int64) if 'day' in df else np.zeros(len(df), dtype=np.int64)
+        stamps = df['timestamp'].to_numpy(np.int64)
+
+        # Each unique (day, timestamp) pair is one tick, sorted in replay order
+        ticks, tick_index = np.unique(np.stack([days, stamps], axis=1), axis=0, return_inverse=True)
+        tick_index = tick_index.reshape(-1)
+        self.days = ticks[:, 0]
+        self.timestamps = ticks[:, 1]
+
+        shape = (len(ticks), len(self.products), LEVELS)
+        self.present = np.zeros(shape[:2], dtype=bool)
+        self.present[tick_index, codes] = True
+
+        self.bid_prices = np.zeros(shape, dtype=np.int64)
+        self.bid_volumes = np.zeros(shape, dtype=np.int64)
+        self.ask_prices = np.zeros(shape, dtype=np.int64)
+        self.ask_volumes = np.zeros(shape, dtype=np.int64)
+
+        for level in range(LEVELS):
+            for side, prices, volumes in (('bid', self.bid_prices, self.bid_volumes), ('ask', self.ask_prices, self.ask_volumes)):
+                price_column = df[f'{side}_price_{level + 1}'].to_numpy(np.float64)
+                volume_column = df[f'{side}_volume_{level + 1}'].to_numpy(np.float64)
+
+                # Missing levels are stored with a volume of 0 and skipped when building books
+                missing = np.isnan(price_column) | np.isnan(volume_column)
+                prices[tick_index, codes, level] = np.where(missing, 0, price_column).astype(np.int64)
+                volumes[tick_index, codes, level] = np.where(missing, 0, volume_column).astype(np.int64)
+
+        self.mid_prices = np.full(shape[:2], np.nan)
+        self.mid_prices[tick_index, codes] = df['mid_price'].to_numpy(np.float64)
+
+        self.listings = {product: Listing(symbol=product, product=product, denomination=SEASHELLS) for product in self.products}
+
+    @classmethod
+    def from_arrays(cls, products: List[Product], arrays: Dict[str, np.ndarray]) -> 'PriceReplay':
+        """Build a replay over arrays that were already loaded, without parsing a file.
+
+        Args:
+            products (List[str]): The products in column order.
+            arrays (Dict[str, np.ndarray]): One array for each name in ARRAY_FIELDS.
+
+        Returns:
+            PriceReplay: A replay backed by the given arrays.
+        """
+        replay = cls.__new__(cls)
+        replay.products = list(products)
+        for field in ARRAY_FIELDS:
+            setattr(replay, field, arrays[field])
+        replay.listings = {product: Listing(symbol=product, product=product, denomination=SEASHELLS) for product in replay.products}
+        return replay
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def day_numbers(self) -> List[int]:
+        """Return the distinct days of the replay in order."""
+        return np.unique(self.days).tolist()
+
+    def select_day(self, day: int) -> 'PriceReplay':
+        """Return a replay over the ticks of a single day.
+
+        Ticks are sorted by day, so the day is a contiguous slice and the
+        returned replay shares its arrays with this one.
+
+        Args:
+            day (int): The day to select.
+
+        Returns:
+            PriceReplay: A replay over views of the day's ticks.
+        """
+        start, stop = np.searchsorted(self.days, [day, day + 1])
+        return PriceReplay.from_arrays(self.products, {field: getattr(self, field)[start:stop] for field in ARRAY_FIELDS})
+
+    def order_depths(self, tick: int) -> Dict[Product, OrderDepth]:
+        """Build the order depths of every product present at a tick.
+
+        Args:
+            tick (int): The tick index.
+
+        Returns:
+            Dict[str, OrderDepth]: The order depth of each product, with best prices first.
+        """
+        bid_prices = self.bid_prices[tick].tolist()
+        bid_volumes = self.bid_volumes[tick].tolist()
+        ask_prices = self.ask_prices[tick].tolist()
+        ask_volumes = self.ask_volumes[tick].tolist()
+        present = self.present[tick].tolist()
+
+        order_depths = {}
+        for code, product in enumerate(self.products):
+            if present[code]:
+                order_depths[product] = OrderDepth(
+                    {price: volume for price, volume in zip(bid_prices[code], bid_volumes[code]) if volume},
+                    {price: -volume for price, volume in zip(ask_prices[code], ask_volumes[code]) if volume},
+                )
+
+        return order_depths
+
+    def states(self, position: Dict[Product, Position] = None, trader_data: str = "") -> Iterator[TradingState]:
+        """Yield a TradingState for every tick in replay order.
+
+        The position dictionary is shared between states, so fills applied to it
+        by the caller are visible on the next tick.
+
+        Args:
+            position (Dict[str, int], optional): The running positions. Defaults to a flat position in every product.
+            trader_data (str): The initial traderData string.
+
+        Yields:
+            TradingState: The trading state of each tick.
+        """
+        if position is None:
+            position = {product: 0 for product in self.products}
+
+        for tick in range(len(self)):
+            yield TradingState(
+                trader_data,
+                int(self.timestamps[tick]),
+                self.listings,
+                self.order_depths(tick),
+                {product: [] for product in self.products},
+                {product: [] for product in self.products},
+                position,
+                Observation({}, {}),
+            )
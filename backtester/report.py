@@ -0,0 +1,180 @@
+import os
+import runpy
+import time
+import traceback
+from multiprocessing import Pool
+from typing import Dict, List, Tuple
+import pandas as pd
+from backtester.cache import load_table, product_index
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each chart group is a script, relative to the repo root, and the data files it reads, relative to the script
+CHART_GROUPS: Dict[str, Tuple[str, List[str]]] = {
+    'pnl_graph': ('round_1/pnl_graph/graph.py', ['historical_data.csv', 'additional.csv', 'orchid_data.csv']),
+    'orchid_graph': ('round_2/orchids/orchid_graph.py', ['orchid-1.csv', 'orchid0.csv', 'orchid1.csv']),
+    'r3graph': ('round_3/algorithmic/r3graph.py', ['r3_data.csv', 'round3day0.csv', 'round3day1.csv', 'round3day2.csv', 'DATASELL.csv', 'DATABUY.csv']),
+    'r4graph': ('round_4/coconuts/r4graph.py', ['r4_data.csv', 'DATASELL.csv', 'DATABUY.csv']),
+    'black_scholes': ('round_4/coconuts/black_scholes.py', ['r4_data.csv']),
+    'graph_pnls': ('round_5/graph_pnls.py', ['pnl_output_per.csv']),
+}
+
+
+def warm_cache(groups: List[str]) -> None:
+    """Build the binary cache, and the product index of prices files, of every data file the groups read.
+
+    The workers then only memory-map the cached columns instead of each parsing the CSVs.
+    Missing files are left for the script to report.
+    """
+    seen = set()
+    for name in groups:
+        script, data_files = CHART_GROUPS[name]
+        directory = os.path.dirname(os.path.join(ROOT, script))
+        for data_file in data_files:
+            path = os.path.join(directory, data_file)
+            if path in seen or not os.path.exists(path):
+                continue
+            seen.add(path)
+            if 'product' in load_table(path):
+                product_index(path)
+
+
+class FigureSaver:
+    """Names the files a chart group writes, numbered in the order its figures are shown."""
+
+    def __init__(self, output_dir: str, group: str):
+        self.output_dir = output_dir
+        self.group = group
+        self.files: List[str] = []
+
+    def path(self, extension: str) -> str:
+        """Return the path of the next figure of the group."""
+        name = f"{self.group}-{len(self.files) + 1}.{extension}"
+        self.files.append(name)
+        return os.path.join(self.output_dir, name)
+
+
+def install_headless(saver: FigureSaver) -> None:
+    """Replace the blocking show calls of every plotting library with writes to files.
+
+    matplotlib figures are saved as PNG on plt.show, plotly figures as HTML on
+    Figure.show, and the top-level Qt widgets as PNG on QApplication.exec_. tkinter
+    windows become inert, since their only use is to host matplotlib figures.
+    Libraries that are not installed are skipped, and the script then fails on
+    its own import.
+    """
+    os.environ['MPLBACKEND'] = 'Agg'
+    os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        def show(*args, **kwargs):
+            for number in plt.get_fignums():
+                plt.figure(number).savefig(saver.path('png'), dpi=100)
+            plt.close('all')
+
+        plt.show = show
+    except ImportError:
+        pass
+
+    try:
+        from plotly.basedatatypes import BaseFigure
+        BaseFigure.show = lambda figure, *args, **kwargs: figure.write_html(saver.path('html'), include_plotlyjs='cdn')
+    except ImportError:
+        pass
+
+    try:
+        from PyQt5.QtWidgets import QApplication
+
+        def exec_(application=None):
+            QApplication.processEvents()
+            for widget in QApplication.topLevelWidgets():
+                if widget.isVisible():
+                    widget.grab().save(saver.path('png'))
+            return 0
+
+        QApplication.exec_ = exec_
+    except ImportError:
+        pass
+
+    try:
+        import tkinter
+
+        class HeadlessTk:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: None
+
+        tkinter.Tk = HeadlessTk
+    except ImportError:
+        pass
+
+
+def _render_group(task: Tuple[str, str]) -> dict:
+    name, output_dir = task
+    script = os.path.join(ROOT, CHART_GROUPS[name][0])
+    saver = FigureSaver(output_dir, name)
+    install_headless(saver)
+
+    # The scripts read their data relative to their own directory
+    os.chdir(os.path.dirname(script))
+    start = time.perf_counter()
+    error = ''
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except BaseException as exception:
+        error = ''.join(traceback.format_exception_only(type(exception), exception)).strip()
+    return {'group': name, 'status': 'failed' if error else 'ok', 'files': len(saver.files),
+            'seconds': time.perf_counter() - start, 'error': error, 'outputs': saver.files}
+
+
+def write_index(output_dir: str, rows: List[dict]) -> str:
+    """Write an index.html linking every rendered figure, grouped by chart group, and return its path."""
+    sections = []
+    for row in rows:
+        items = []
+        for name in row['outputs']:
+            if name.endswith('.png'):
+                items.append(f'<img src="{name}" style="max-width:100%">')
+            else:
+                items.append(f'<iframe src="{name}" style="width:100%;height:600px;border:0"></iframe>')
+        status = f"<pre>{row['error']}</pre>" if row['error'] else ''
+        sections.append(f"<h2>{row['group']}</h2>{status}" + ''.join(items))
+
+    path = os.path.join(output_dir, 'index.html')
+    with open(path, 'w') as file:
+        file.write("<html><body><h1>Chart report</h1>" + ''.join(sections) + "</body></html>")
+    return path
+
+
+def render_report(output_dir: str = 'report', groups: List[str] = None, processes: int = None) -> pd.DataFrame:
+    """Render every chart group to image and HTML files without a display, one worker process per group.
+
+    The data files of all groups are cached first, so every worker memory-maps the
+    same parsed columns. Each group then runs in a fresh worker, with the show calls of
+    its plotting libraries replaced by file writes, so a failing or slow group neither
+    blocks nor affects the others.
+
+    Args:
+        output_dir (str): The directory the figures and index.html are written to.
+        groups (List[str], optional): The chart groups to render. Defaults to all of CHART_GROUPS.
+        processes (int, optional): The number of worker processes. Defaults to one per group.
+
+    Returns:
+        pd.DataFrame: Per group, the status, the number of files written, the seconds taken and any error.
+    """
+    groups = list(CHART_GROUPS) if groups is None else groups
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    warm_cache(groups)
+
+    with Pool(processes or len(groups), maxtasksperchild=1) as pool:
+        rows = pool.map(_render_group, [(name, output_dir) for name in groups], chunksize=1)
+
+    write_index(output_dir, rows)
+    return pd.DataFrame(rows).drop(columns=['outputs'])
@@ -0,0 +1,66 @@
+import numpy as np
+from multiprocessing.shared_memory import SharedMemory
+from backtester.replay import PriceReplay, ARRAY_FIELDS
+
+# Blocks attached by this process, kept open for as long as their arrays are in use
+_attached_blocks = []
+
+
+class SharedReplay:
+    """
+    Publishes the arrays of a PriceReplay in shared memory for worker processes.
+
+    The handle is a small picklable description of the blocks, so workers can
+    attach to one read-only copy of the market data instead of re-parsing CSVs.
+    Use as a context manager so the blocks are unlinked once the workers finish.
+    """
+
+    def __init__(self, replay: PriceReplay):
+        """Copy a replay's arrays into new shared memory blocks.
+
+        Args:
+            replay (PriceReplay): The loaded replay to share.
+        """
+        self.blocks = []
+        self.handle = {'products': list(replay.products), 'arrays': {}}
+
+        for field in ARRAY_FIELDS:
+            array = getattr(replay, field)
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.handle['arrays'][field] = (block.name, array.shape, array.dtype.str)
+
+    def close(self) -> None:
+        """Release and unlink every shared block."""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self) -> 'SharedReplay':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def attach_replay(handle: dict) -> PriceReplay:
+    """Attach to a replay published by SharedReplay, without copying its arrays.
+
+    Args:
+        handle (dict): The SharedReplay.handle of the publishing process.
+
+    Returns:
+        PriceReplay: A replay over read-only views of the shared arrays.
+    """
+    arrays = {}
+    for field, (name, shape, dtype) in handle['arrays'].items():
+        block = SharedMemory(name=name)
+        _attached_blocks.append(block)
+
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.flags.writeable = False
+        arrays[field] = array
+
+    return PriceReplay.from_arrays(handle['products'], arrays)
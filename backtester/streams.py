@@ -0,0 +1,170 @@
+import csv
+import heapq
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+from datamodel import Observation, TradingState, Product, Position
+from backtester.compact import ConversionObservation, Listing, OrderDepth, Trade
+from backtester.cache import sniff_delimiter
+from backtester.replay import LEVELS, SEASHELLS
+from backtester.matching import SUBMISSION
+
+# Events at the same timestamp are ordered observations, then books, then trades
+OBSERVATION = 0
+PRICE = 1
+TRADE = 2
+
+OBSERVATION_FIELDS = {'timestamp', 'DAY', 'day', 'bidPrice', 'askPrice', 'TRANSPORT_FEES', 'EXPORT_TARIFF', 'IMPORT_TARIFF', 'SUNLIGHT', 'HUMIDITY'}
+
+TradeFile = Union[str, Tuple[str, int]]
+
+
+def read_rows(csv_file: str) -> Iterator[Dict[str, str]]:
+    """Lazily read the rows of a ';' or ',' delimited CSV file."""
+    with open(csv_file, 'r', newline='') as file:
+        yield from csv.DictReader(file, delimiter=sniff_delimiter(csv_file))
+
+
+def price_events(csv_file: str) -> Iterator[tuple]:
+    """Yield an order book event for each row of a prices file.
+
+    Args:
+        csv_file (str): Path to a prices file.
+
+    Yields:
+        tuple: (day, timestamp, PRICE, (product, OrderDepth)).
+    """
+    for row in read_rows(csv_file):
+        buy_orders = {}
+        sell_orders = {}
+        for level in range(1, LEVELS + 1):
+            if row[f'bid_price_{level}'] and row[f'bid_volume_{level}']:
+                buy_orders[int(float(row[f'bid_price_{level}']))] = int(float(row[f'bid_volume_{level}']))
+            if row[f'ask_price_{level}'] and row[f'ask_volume_{level}']:
+                sell_orders[int(float(row[f'ask_price_{level}']))] = -int(float(row[f'ask_volume_{level}']))
+
+        yield int(row.get('day') or 0), int(row['timestamp']), PRICE, (row['product'], OrderDepth(buy_orders, sell_orders))
+
+
+def trade_events(csv_file: str, day: int = 0) -> Iterator[tuple]:
+    """Yield a trade event for each row of a trades file.
+
+    Args:
+        csv_file (str): Path to a trades file with timestamp, buyer, seller, symbol, price and quantity.
+        day (int): The day the file was recorded on, since trade files carry no day column.
+
+    Yields:
+        tuple: (day, timestamp, TRADE, Trade).
+    """
+    for row in read_rows(csv_file):
+        timestamp = int(row['timestamp'])
+        trade = Trade(row['symbol'], float(row['price']), int(row['quantity']), row['buyer'] or "", row['seller'] or "", timestamp)
+        yield day, timestamp, TRADE, trade
+
+
+def observation_events(csv_file: str) -> Iterator[tuple]:
+    """Yield a conversion observation event for each row of an observations file.
+
+    The product is the column that is not an observation field, e.g. ORCHIDS. Files
+    with only that single price column use it as both the bid and the ask price.
+
+    Args:
+        csv_file (str): Path to an observations file.
+
+    Yields:
+        tuple: (day, timestamp, OBSERVATION, (product, ConversionObservation)).
+    """
+    for row in read_rows(csv_file):
+        day = int(row.get('DAY') or row.get('day') or 0)
+        for product in row.keys() - OBSERVATION_FIELDS:
+            bid_price = float(row.get('bidPrice') or row[product])
+            ask_price = float(row.get('askPrice') or row[product])
+            observation = ConversionObservation(
+                bid_price, ask_price,
+                float(row['TRANSPORT_FEES']), float(row['EXPORT_TARIFF']), float(row['IMPORT_TARIFF']),
+                float(row['SUNLIGHT']), float(row['HUMIDITY']),
+            )
+            yield day, int(row['timestamp']), OBSERVATION, (product, observation)
+
+
+def merged_events(prices: Iterable[str] = (), trades: Iterable[TradeFile] = (), observations: Iterable[str] = ()) -> Iterator[tuple]:
+    """Merge the events of every file into one (day, timestamp) ordered stream.
+
+    Each file must already be in timestamp order, which every exported file is.
+    Only one row per file is held in memory at a time.
+
+    Args:
+        prices (Iterable[str]): Prices files.
+        trades (Iterable[str or Tuple[str, int]]): Trades files, optionally paired with their day.
+        observations (Iterable[str]): Observations files.
+
+    Returns:
+        Iterator[tuple]: The (day, timestamp, kind, payload) events of every file.
+    """
+    streams = [price_events(csv_file) for csv_file in prices]
+    streams += [trade_events(*trade_file) if isinstance(trade_file, tuple) else trade_events(trade_file) for trade_file in trades]
+    streams += [observation_events(csv_file) for csv_file in observations]
+    return heapq.merge(*streams, key=lambda event: (event[0], event[1], event[2]))
+
+
+def trading_states(prices: Iterable[str] = (), trades: Iterable[TradeFile] = (), observations: Iterable[str] = (),
+                   position: Dict[Product, Position] = None, trader_data: str = "") -> Iterator[TradingState]:
+    """Stream a TradingState per tick from any combination of prices, trades and observations files.
+
+    Every distinct (day, timestamp) in the merged files is a tick. As on the
+    exchange, trades are delivered on the tick after the one they happened in:
+    trades with the SUBMISSION buyer or seller go to own_trades and all others to
+    market_trades. Trades do not carry over into a new day.
+
+    Args:
+        prices (Iterable[str]): Prices files, for the order depths.
+        trades (Iterable[str or Tuple[str, int]]): Trades files, optionally paired with their day (default 0).
+        observations (Iterable[str]): Observations files, for the conversion observations.
+        position (Dict[str, int], optional): The running positions, shared between states.
+        trader_data (str): The initial traderData string.
+
+    Yields:
+        TradingState: The trading state of each tick.
+    """
+    if position is None:
+        position = {}
+
+    listings = {}
+    current = None
+    order_depths = {}
+    conversion_observations = {}
+    own_trades = {}
+    market_trades = {}
+    pending_own_trades = {}
+    pending_market_trades = {}
+
+    for day, timestamp, kind, payload in merged_events(prices, trades, observations):
+        if (day, timestamp) != current:
+            if current is not None:
+                yield TradingState(trader_data, current[1], listings, order_depths, own_trades, market_trades,
+                                   position, Observation({}, conversion_observations))
+
+            # Trades of the previous tick are delivered on this one, unless a new day has started
+            if current is not None and current[0] != day:
+                pending_own_trades, pending_market_trades = {}, {}
+            current = (day, timestamp)
+            order_depths = {}
+            conversion_observations = {}
+            own_trades, market_trades = pending_own_trades, pending_market_trades
+            pending_own_trades, pending_market_trades = {}, {}
+
+        if kind == PRICE:
+            product, order_depth = payload
+            order_depths[product] = order_depth
+            if product not in listings:
+                listings[product] = Listing(symbol=product, product=product, denomination=SEASHELLS)
+
+        elif kind == OBSERVATION:
+            product, observation = payload
+            conversion_observations[product] = observation
+
+        else:
+            pending = pending_own_trades if SUBMISSION in (payload.buyer, payload.seller) else pending_market_trades
+            pending.setdefault(payload.symbol, []).append(payload)
+
+    if current is not None:
+        yield TradingState(trader_data, current[1], listings, order_depths, own_trades, market_trades,
+                           position, Observation({}, conversion_observations))
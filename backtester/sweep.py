@@ -0,0 +1,101 @@
+import importlib
+import itertools
+import random
+import pandas as pd
+from multiprocessing import Pool
+from typing import Any, Dict, List
+from datamodel import Product
+from backtester.replay import PriceReplay
+from backtester.shared import SharedReplay, attach_replay
+from backtester.engine import Backtest
+
+# Per-worker state, set once by the pool initializer
+_worker_replay = None
+_worker_trader_class = None
+
+
+def grid_search(space: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Expand a parameter grid into every combination of its values.
+
+    Args:
+        space (Dict[str, List]): The candidate values of each Trader attribute.
+
+    Returns:
+        List[Dict]: One configuration per point of the grid.
+    """
+    names = list(space.keys())
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_search(space: Dict[str, Any], samples: int, seed: int = None) -> List[Dict[str, Any]]:
+    """Draw random configurations from a search space.
+
+    A (low, high) tuple is sampled uniformly, as integers when both bounds are
+    integers, and a list is sampled as a choice between its values.
+
+    Args:
+        space (Dict[str, Any]): The range or candidate values of each Trader attribute.
+        samples (int): The number of configurations to draw.
+        seed (int, optional): Seed for a reproducible search.
+
+    Returns:
+        List[Dict]: The sampled configurations.
+    """
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(samples):
+        config = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    config[name] = rng.randint(low, high)
+                else:
+                    config[name] = rng.uniform(low, high)
+            else:
+                config[name] = rng.choice(values)
+        configs.append(config)
+    return configs
+
+
+def _init_worker(handle: dict, trader_module: str) -> None:
+    global _worker_replay, _worker_trader_class
+    _worker_replay = attach_replay(handle)
+    _worker_trader_class = importlib.import_module(trader_module).Trader
+
+
+def _run_config(params: Dict[str, Any]) -> Dict[str, Any]:
+    trader = _worker_trader_class()
+    for name, value in params.items():
+        if not hasattr(trader, name):
+            raise AttributeError(f"Trader has no parameter named {name}")
+        setattr(trader, name, value)
+
+    return {**params, **Backtest(trader, _worker_replay).run().summary()}
+
+
+def sweep(csv_file: str, configs: List[Dict[str, Any]], products: List[Product] = None,
+          processes: int = None, trader_module: str = 'trader') -> pd.DataFrame:
+    """Backtest every configuration across a process pool and rank the results.
+
+    The prices file is parsed once and published in shared memory, so each worker
+    attaches to the same read-only arrays. Every configuration overrides the
+    matching attributes of a freshly constructed Trader.
+
+    Args:
+        csv_file (str): Path to the prices file to backtest on.
+        configs (List[Dict]): The Trader attribute overrides of each configuration.
+        products (List[str], optional): The products to replay. Defaults to every product in the file.
+        processes (int, optional): The number of worker processes. Defaults to the number of cores.
+        trader_module (str): The module the Trader class is imported from.
+
+    Returns:
+        pd.DataFrame: One row per configuration with its PnL, max drawdown and turnover, best PnL first.
+    """
+    replay = PriceReplay(csv_file, products)
+
+    with SharedReplay(replay) as shared:
+        with Pool(processes, initializer=_init_worker, initargs=(shared.handle, trader_module)) as pool:
+            rows = list(pool.imap_unordered(_run_config, configs))
+
+    return pd.DataFrame(rows).sort_values('pnl', ascending=False).reset_index(drop=True)
@@ -0,0 +1,63 @@
+from typing import Dict, Iterable, List, Optional
+# The engine runs inside the Trader, which the exchange runs as a single file, so it lives in trader.py
+from trader import BASKET_TRANSLATION as TRANSLATION, BASKET_WEIGHTS, GIFT_BASKET, BasketSpread
+
+
+def replay_trades(csv_files: Iterable[str], weights: Dict[str, int] = BASKET_WEIGHTS, translation: float = TRANSLATION,
+                  alpha: Optional[float] = None) -> List[dict]:
+    """Run the engine offline over market trade files, using each product's last trade price as its quote.
+
+    The files are read in order as one history, and the spread is observed once per
+    timestamp that has trades, after all of its trades are applied.
+
+    Args:
+        csv_files (Iterable[str]): Semicolon-separated trade files such as round3day0.csv.
+        weights (Dict[str, int]): The number of units of each component in a basket.
+        translation (float): The premium of the basket over its components.
+        alpha (Optional[float]): The EMA smoothing factor, or None for the mean and variance of all observations.
+
+    Returns:
+        List[dict]: Per observation, the day, timestamp, synthetic and basket mids, spread, mean, std and z-score.
+    """
+    from backtester.cache import read_csv
+
+    engine = BasketSpread(weights, translation, alpha)
+    rows = []
+    for day, csv_file in enumerate(csv_files):
+        trades = read_csv(csv_file, ['timestamp', 'symbol', 'price'])
+        timestamps = trades['timestamp'].to_numpy()
+        symbols = trades['symbol'].to_numpy()
+        prices = trades['price'].to_numpy()
+        for index in range(len(trades)):
+            symbol, price = symbols[index], prices[index]
+            if symbol == GIFT_BASKET:
+                engine.update_basket(price, price)
+            elif symbol in engine.weights:
+                engine.update_component(symbol, price, price)
+
+            # Observe once all the trades of a timestamp are in
+            if index + 1 < len(trades) and timestamps[index + 1] == timestamps[index]:
+                continue
+            spread = engine.observe()
+            if spread is not None:
+                rows.append({'day': day, 'timestamp': timestamps[index], 'synthetic_mid': engine.synthetic_mid(),
+                             'basket_mid': (engine.basket_bid + engine.basket_ask) / 2, 'spread': spread,
+                             'mean': engine.mean, 'std': engine.std(), 'zscore': engine.zscore()})
+    return rows
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import pandas as pd
+
+    directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'round_3', 'algorithmic')
+    files = sys.argv[1:] or [os.path.join(directory, f"round3day{day}.csv") for day in range(3)]
+    history = pd.DataFrame(replay_trades(files))
+
+    # The incremental statistics must match the batch ones over the same spreads
+    assert abs(history['mean'].iloc[-1] - history['spread'].mean()) < 1e-6
+    assert abs(history['std'].iloc[-1] - history['spread'].std(ddof=0)) < 1e-6
+    print(history.groupby('day')['spread'].agg(['count', 'mean', 'std']).to_string())
+    mean, std = history['mean'].iloc[-1], history['std'].iloc[-1]
+    print(f"spread mean {mean:.2f}, std {std:.2f}, (sell, buy) edges at z=1: ({round(mean + std)}, {round(std - mean)})")
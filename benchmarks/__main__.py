@@ -0,0 +1,41 @@
+import argparse
+import sys
+import pandas as pd
+from benchmarks.suite import ROUNDS, THRESHOLD, BASELINE_FILE, run_suite, load_baseline, save_baseline, compare, record_samples
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Benchmark Trader.run on recorded ticks and compare against the baseline.")
+    parser.add_argument('--rounds', nargs='*', choices=list(ROUNDS), help="rounds to benchmark (default: all)")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="allowed relative regression, e.g. 0.25 for 25%%")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per round, the fastest is kept")
+    parser.add_argument('--trader', default='trader', help="module to import the Trader class from")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline JSON to compare against")
+    parser.add_argument('--update', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--record', action='store_true', help="re-record the tick samples from the data files first")
+    args = parser.parse_args()
+
+    if args.record:
+        record_samples()
+
+    results = run_suite(args.rounds, args.trader, args.repeat)
+    for round_name, methods in results.items():
+        print(round_name)
+        print(pd.DataFrame(methods).T.to_string(float_format='{:.0f}'.format))
+
+    if args.update:
+        save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    regressions = compare(results, load_baseline(args.baseline), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
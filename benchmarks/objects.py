@@ -0,0 +1,62 @@
+import timeit
+import tracemalloc
+import pandas as pd
+import datamodel
+from backtester import compact
+
+COUNT = 100_000
+
+# Constructor arguments of each class, as the replay builds them
+ARGUMENTS = {
+    'Order': ("STARFRUIT", 5040, 3),
+    'Trade': ("STARFRUIT", 5040.0, 3, "Remy", "Vinnie", 100),
+    'Listing': ("STARFRUIT", "STARFRUIT", "SEASHELLS"),
+    'ConversionObservation': (1098.25, 1098.25, 0.9, 10.5, -5.0, 2100.0, 70.0),
+    'OrderDepth': ({5039: 12}, {5043: -12}),
+}
+
+
+def bytes_per_object(cls, args, count: int = COUNT) -> float:
+    """Measure the memory held per instance, excluding the shared arguments."""
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    objects = [cls(*args) for _ in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return (current - start) / count
+
+
+def construction_ns(cls, args, count: int = COUNT) -> float:
+    """Measure the fastest construction time per instance over a few repeats."""
+    return min(timeit.repeat(lambda: cls(*args), number=count, repeat=5)) / count * 1e9
+
+
+def compare_classes(count: int = COUNT) -> pd.DataFrame:
+    """Compare the memory and construction time of the datamodel classes and their compact variants."""
+    rows = []
+    for name, args in ARGUMENTS.items():
+        plain, slotted = getattr(datamodel, name), getattr(compact, name)
+        row = {'class': name}
+        row['bytes'] = bytes_per_object(plain, args, count)
+        row['compact_bytes'] = bytes_per_object(slotted, args, count)
+        row['ns'] = construction_ns(plain, args, count)
+        row['compact_ns'] = construction_ns(slotted, args, count)
+        rows.append(row)
+
+    # A batch of trades against the same number of Trade objects
+    trades = [compact.Trade(*ARGUMENTS['Trade']) for _ in range(count)]
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    batch = compact.TradeBatch.from_trades(trades)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows.append({'class': 'TradeBatch (per trade)', 'bytes': rows[1]['bytes'], 'compact_bytes': (current - start) / len(batch)})
+
+    table = pd.DataFrame(rows).set_index('class')
+    table['saved_pct'] = 100 * (1 - table['compact_bytes'] / table['bytes'])
+    return table
+
+
+if __name__ == "__main__":
+    print(compare_classes().to_string(float_format='{:.1f}'.format))
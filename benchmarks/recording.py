@@ -0,0 +1,53 @@
+import os
+import tempfile
+import time
+from backtester import Backtest, StateWriter, encode, read_records
+from benchmarks.suite import load_round
+from trader import Trader
+
+
+def compare_encoders(round_name: str = 'round2') -> dict:
+    """Record a round's ticks, check the round trip and time the encoder against TradingState.toJSON.
+
+    Returns:
+        dict: The records, whether every record re-encodes identically, and the per-state
+        encode time of toJSON with the Observation string, and of encode.
+    """
+    replay, conversions = load_round(round_name)
+    path = os.path.join(tempfile.mkdtemp(), f'{round_name}.jsonl')
+
+    start = time.perf_counter()
+    with StateWriter(path) as writer:
+        Backtest(Trader(), replay, conversions=conversions(), recorder=writer).run()
+    record_seconds = time.perf_counter() - start
+
+    with open(path, 'r') as file:
+        lines = file.read().splitlines()
+    records = list(read_records(path))
+    lossless = all(encode(*record) == line for record, line in zip(records, lines))
+
+    states = [state for state, *_ in records]
+    start = time.perf_counter()
+    for state in states:
+        state.toJSON()
+        str(state.observations)
+    to_json = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for record in records:
+        encode(*record)
+    encoder = time.perf_counter() - start
+
+    return {
+        'records': len(records),
+        'lossless': lossless,
+        'backtest_with_recording_s': record_seconds,
+        'toJSON_us': to_json / len(states) * 1e6,
+        'encode_us': encoder / len(records) * 1e6,
+        'speedup': to_json / encoder,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in compare_encoders().items():
+        print(f"{name}: {value:.2f}" if isinstance(value, float) else f"{name}: {value}")
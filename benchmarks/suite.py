@@ -0,0 +1,207 @@
+import functools
+import importlib
+import json
+import os
+import tracemalloc
+import numpy as np
+from typing import Dict, List
+from backtester.replay import PriceReplay
+from backtester.engine import Backtest
+from backtester.conversions import ConversionEngine
+from backtester.profiler import LatencyProfiler, STRATEGIES, RUN
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+SAMPLE_DIR = os.path.join(BENCHMARK_DIR, 'samples')
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+SAMPLE_TICKS = 500
+THRESHOLD = 0.25
+METRICS = ('ns_per_tick', 'peak_bytes', 'retained_bytes')
+# Changes smaller than these are noise whatever the threshold
+MIN_CHANGE = {'ns_per_tick': 1000, 'peak_bytes': 1024, 'retained_bytes': 1024}
+
+# The recorded ticks of each round, taken from the start of one day of its data.
+# Round 3 is missing because its prices file is not in the repo.
+ROUNDS = {
+    'round1': {'prices': 'round_1/pnl_graph/historical_data.csv', 'day': 0},
+    'round2': {'prices': 'round_2/orchids/test_orchid.csv', 'day': 1, 'observations': 'round_2/orchids/orchid1.csv'},
+    'round4': {'prices': 'round_4/coconuts/r4_data.csv', 'day': 1},
+}
+
+
+def sample_path(round_name: str, kind: str) -> str:
+    """Return the path of a round's recorded prices or observations sample."""
+    return os.path.join(SAMPLE_DIR, f'{round_name}_{kind}.csv')
+
+
+def record_lines(source: str, destination: str, day: int, ticks: int = SAMPLE_TICKS) -> None:
+    """Copy the rows of the first ticks of a day from a data file, keeping its exact format.
+
+    Args:
+        source (str): A prices or observations file with a timestamp and a day or DAY column.
+        destination (str): The sample file to write.
+        day (int): The day to sample.
+        ticks (int): The number of timestamps to keep.
+    """
+    with open(source, 'r') as file:
+        header = file.readline()
+        delimiter = ';' if header.count(';') > header.count(',') else ','
+        columns = header.strip().split(delimiter)
+        day_column = columns.index('day' if 'day' in columns else 'DAY')
+        timestamp_column = columns.index('timestamp')
+
+        timestamps = set()
+        lines = [header]
+        for line in file:
+            values = line.split(delimiter)
+            if int(values[day_column]) != day:
+                continue
+            timestamps.add(int(values[timestamp_column]))
+            if len(timestamps) > ticks:
+                break
+            lines.append(line)
+
+    with open(destination, 'w') as file:
+        file.writelines(lines)
+
+
+def record_samples(ticks: int = SAMPLE_TICKS) -> None:
+    """Re-record the tick samples of every round from the repo's data files."""
+    os.makedirs(SAMPLE_DIR, exist_ok=True)
+    for round_name, sources in ROUNDS.items():
+        for kind in ('prices', 'observations'):
+            if kind in sources:
+                record_lines(os.path.join(REPO_DIR, sources[kind]), sample_path(round_name, kind), sources['day'], ticks)
+
+
+def load_round(round_name: str):
+    """Load a round's recorded ticks, returning the replay and a factory for its conversion engine."""
+    replay = PriceReplay(sample_path(round_name, 'prices'))
+    if 'observations' in ROUNDS[round_name]:
+        return replay, lambda: ConversionEngine(replay, [sample_path(round_name, 'observations')])
+    return replay, lambda: None
+
+
+def trace_allocations(trader, names: List[str]) -> Dict[str, Dict[str, List[int]]]:
+    """Wrap methods of a trader to record the tracemalloc peak and retained bytes of each call.
+
+    Nested calls reset the peak, so only methods that do not call each other should be traced together.
+
+    Args:
+        trader: The Trader instance.
+        names (List[str]): The methods to trace. Methods the trader does not define are skipped.
+
+    Returns:
+        Dict[str, Dict[str, List[int]]]: Per method, the 'peak_bytes' and 'retained_bytes' of every call.
+    """
+    samples = {}
+    for name in names:
+        if not hasattr(trader, name):
+            continue
+        method = getattr(trader, name)
+        peaks, retained = [], []
+        samples[name] = {'peak_bytes': peaks, 'retained_bytes': retained}
+
+        def wrapper(*args, method=method, peaks=peaks, retained=retained, **kwargs):
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            result = method(*args, **kwargs)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - start)
+            retained.append(current - start)
+            return result
+
+        setattr(trader, name, functools.wraps(method)(wrapper))
+    return samples
+
+
+def measure_round(round_name: str, trader_class, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Benchmark Trader.run and each strategy on a round's recorded ticks.
+
+    The latency of a method is its median per call, taking the fastest of the
+    repeated runs. Allocations are measured in separate runs under tracemalloc,
+    one for run and one for the strategies, so tracing never skews the timings.
+
+    Args:
+        round_name (str): A key of ROUNDS.
+        trader_class: The Trader class, instantiated fresh for every run.
+        repeat (int): The number of timed runs.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Per method, the ns_per_tick, peak_bytes and retained_bytes.
+    """
+    replay, conversions = load_round(round_name)
+    results = {}
+
+    for _ in range(repeat):
+        profiler = LatencyProfiler()
+        Backtest(trader_class(), replay, conversions=conversions(), profiler=profiler).run()
+        for name, samples in profiler.samples.items():
+            if samples:
+                latency = float(np.median(samples))
+                entry = results.setdefault(name, {'ns_per_tick': latency})
+                entry['ns_per_tick'] = min(entry['ns_per_tick'], latency)
+
+    for names in ([RUN], STRATEGIES):
+        trader = trader_class()
+        allocations = trace_allocations(trader, names)
+        tracemalloc.start()
+        try:
+            Backtest(trader, replay, conversions=conversions()).run()
+        finally:
+            tracemalloc.stop()
+        for name, samples in allocations.items():
+            if samples['peak_bytes']:
+                results[name]['peak_bytes'] = float(np.mean(samples['peak_bytes']))
+                results[name]['retained_bytes'] = float(np.mean(samples['retained_bytes']))
+
+    return results
+
+
+def run_suite(rounds: List[str] = None, trader_module: str = 'trader', repeat: int = 5) -> Dict[str, dict]:
+    """Benchmark every round, returning {round: {method: {metric: value}}}."""
+    trader_class = importlib.import_module(trader_module).Trader
+    return {round_name: measure_round(round_name, trader_class, repeat) for round_name in (rounds or ROUNDS)}
+
+
+def load_baseline(baseline_file: str = BASELINE_FILE) -> dict:
+    """Load the committed baseline, or an empty one if there is none yet."""
+    if not os.path.exists(baseline_file):
+        return {}
+    with open(baseline_file, 'r') as file:
+        return json.load(file)
+
+
+def save_baseline(results: dict, baseline_file: str = BASELINE_FILE) -> None:
+    """Write results as the new baseline."""
+    with open(baseline_file, 'w') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def compare(results: dict, baseline: dict, threshold: float = THRESHOLD) -> List[str]:
+    """Find the metrics that regressed past the threshold relative to the baseline.
+
+    Args:
+        results (dict): The results of run_suite.
+        baseline (dict): The baseline results.
+        threshold (float): The allowed relative increase of a metric, e.g. 0.25 for 25%.
+
+    Returns:
+        List[str]: A description of every regression.
+    """
+    regressions = []
+    for round_name, methods in results.items():
+        for name, metrics in methods.items():
+            base = baseline.get(round_name, {}).get(name)
+            if base is None:
+                continue
+            for metric in METRICS:
+                if metric not in metrics or metric not in base:
+                    continue
+                value, reference = metrics[metric], base[metric]
+                if value > reference * (1 + threshold) and value - reference > MIN_CHANGE[metric]:
+                    regressions.append(f"{round_name} {name} {metric}: {reference:.0f} -> {value:.0f} "
+                                       f"(+{(value / reference - 1) * 100 if reference else float('inf'):.0f}%)")
+    return regressions
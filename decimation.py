@@ -0,0 +1,181 @@
+import numpy as np
+from typing import List, Tuple
+
+# Series at most this many points per pixel are drawn as they are
+MIN_POINTS = 2
+# Width in pixels assumed before a chart knows its size
+DEFAULT_PIXELS = 2000
+
+
+def minmax(x, y, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Downsample a series to the lowest and highest point of each of a number of equal-count buckets.
+
+    Every peak and trough of the series is kept, in time order, so a line drawn through
+    the result covers exactly the vertical extent of the full series at each pixel.
+    NaN points are dropped.
+
+    Args:
+        x: The x values, increasing.
+        y: The y values.
+        buckets (int): The number of buckets, usually the chart width in pixels.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: At most 2 * buckets points.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    finite = ~np.isnan(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    if len(y) <= MIN_POINTS * buckets:
+        return x, y
+
+    starts = np.linspace(0, len(y), buckets + 1).astype(np.int64)[:-1]
+    bucket = np.repeat(np.arange(buckets), np.diff(np.append(starts, len(y))))
+    keep = np.zeros(len(y), dtype=bool)
+    keep[_first_match(y, np.minimum.reduceat(y, starts), bucket)] = True
+    keep[_first_match(y, np.maximum.reduceat(y, starts), bucket)] = True
+    return x[keep], y[keep]
+
+
+def _first_match(y: np.ndarray, values: np.ndarray, bucket: np.ndarray) -> np.ndarray:
+    """Return the index of the first point of each bucket equal to that bucket's value."""
+    matches = np.flatnonzero(y == values[bucket])
+    # Every bucket has at least one match, so keep each match whose bucket differs from the previous one's
+    first = np.flatnonzero(np.diff(bucket[matches], prepend=-1))
+    return matches[first]
+
+
+class Pyramid:
+    """
+    A series pre-decimated at every power-of-two resolution, so any visible range can be
+    redrawn at screen resolution without touching the full series.
+
+    Level 0 is the series itself and each further level halves the points of the one
+    below it with min/max buckets, until fewer than min_points remain. A view of a range
+    takes the coarsest level that still has at least two points per pixel in that range
+    and decimates only those points, so zooming in restores detail and peaks and troughs
+    are never dropped at any level.
+    """
+
+    def __init__(self, x, y, min_points: int = 2 * DEFAULT_PIXELS):
+        """Build the levels of a series.
+
+        Args:
+            x: The x values, increasing.
+            y: The y values.
+            min_points (int): The size below which no coarser level is built.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        # Level 0 is the series without its NaN points
+        self.levels: List[Tuple[np.ndarray, np.ndarray]] = [minmax(x, y, len(y))]
+        while len(self.levels[-1][1]) > min_points:
+            level_x, level_y = self.levels[-1]
+            coarser = minmax(level_x, level_y, len(level_y) // 4)
+            if len(coarser[1]) >= len(level_y):
+                break
+            self.levels.append(coarser)
+
+    def __len__(self) -> int:
+        return len(self.levels[0][1])
+
+    def view(self, start: float = None, stop: float = None, pixels: int = DEFAULT_PIXELS) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the points to draw for an x range at a width in pixels.
+
+        One point either side of the range is included so lines run to the edges of the chart.
+
+        Args:
+            start (float, optional): The first visible x value. Defaults to the start of the series.
+            stop (float, optional): The last visible x value. Defaults to the end of the series.
+            pixels (int): The width of the chart in pixels.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: At most about 2 * pixels points.
+        """
+        pixels = max(int(pixels), 1)
+        chosen = None
+        for level_x, level_y in reversed(self.levels):
+            first = max(np.searchsorted(level_x, -np.inf if start is None else start, 'left') - 1, 0)
+            last = min(np.searchsorted(level_x, np.inf if stop is None else stop, 'right') + 1, len(level_x))
+            chosen = level_x[first:last], level_y[first:last]
+            if last - first >= MIN_POINTS * pixels:
+                break
+        return minmax(chosen[0], chosen[1], pixels)
+
+
+def plot_pyqtgraph(plot_item, x, y, **kwargs):
+    """Plot a series on a pyqtgraph PlotItem, redrawn from its pyramid whenever the x range changes.
+
+    Args:
+        plot_item: The pyqtgraph PlotItem to draw on.
+        x: The x values, increasing.
+        y: The y values.
+        **kwargs: Passed on to PlotItem.plot, such as pen and name.
+
+    Returns:
+        The PlotDataItem of the series.
+    """
+    pyramid = Pyramid(x, y)
+    item = plot_item.plot(*pyramid.view(), **kwargs)
+    view_box = plot_item.getViewBox()
+
+    def redraw(*_):
+        start, stop = view_box.viewRange()[0]
+        item.setData(*pyramid.view(start, stop, view_box.width() or DEFAULT_PIXELS))
+
+    view_box.sigXRangeChanged.connect(redraw)
+    view_box.sigResized.connect(redraw)
+    return item
+
+
+def plot_matplotlib(ax, x, y, *args, **kwargs):
+    """Plot a series on matplotlib axes, redrawn from its pyramid whenever the x limits change.
+
+    Args:
+        ax: The matplotlib Axes to draw on, such as plt.gca().
+        x: The x values, increasing.
+        y: The y values.
+        *args: Passed on to Axes.plot, such as a format string.
+        **kwargs: Passed on to Axes.plot, such as label, color and marker.
+
+    Returns:
+        The Line2D of the series.
+    """
+    pyramid = Pyramid(x, y)
+    line, = ax.plot(*pyramid.view(pixels=ax.bbox.width or DEFAULT_PIXELS), *args, **kwargs)
+
+    def redraw(axes):
+        start, stop = axes.get_xlim()
+        line.set_data(*pyramid.view(start, stop, axes.bbox.width or DEFAULT_PIXELS))
+
+    # The first view spans the whole series with all its extremes, so autoscaling still fits every peak
+    ax.callbacks.connect('xlim_changed', redraw)
+    return line
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(3)
+    count = 1_000_000
+    x = np.arange(count) * 100.0
+    y = np.cumsum(rng.normal(0, 1, count))
+    y[rng.integers(0, count, 20)] += rng.choice([-500, 500], 20)
+
+    started = time.perf_counter()
+    pyramid = Pyramid(x, y)
+    built = time.perf_counter() - started
+
+    # The full view and every zoomed view keep the extremes of their range
+    for start, stop in ((None, None), (x[1000], x[250_000]), (x[500_000], x[500_600])):
+        started = time.perf_counter()
+        view_x, view_y = pyramid.view(start, stop, 1500)
+        elapsed = time.perf_counter() - started
+        first = 0 if start is None else int(start // 100)
+        last = count if stop is None else int(stop // 100) + 1
+        assert view_y.max() >= y[first:last].max() and view_y.min() <= y[first:last].min()
+        assert np.isin(view_y, y).all()
+        assert len(view_y) <= 2 * 1500 + 2
+        print(f"view of {last - first} points: {len(view_y)} drawn in {elapsed * 1e3:.2f} ms")
+    print(f"{count} points, {len(pyramid.levels)} levels built in {built * 1e3:.0f} ms")
@@ -1,7 +1,13 @@
+import os
+import sys
 import csv
 import matplotlib.pyplot as plt
 import pandas as pd
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from backtester.cache import read_csv
+from indicators import book_vwaps
+
 def calculate_averages(rows):
     bid_price_values = [int(row['bid_price_1']) for row in rows]
     ask_price_values = [int(row['ask_price_1']) for row in rows]
@@ -29,9 +35,7 @@ def calculate_averages(rows):
     return bid_price_values, avg_bid_price, ask_price_values, avg_ask_price
 
 def get_mean(csv_file):
-    with open(csv_file, 'r') as file:
-        reader = csv.DictReader(file, delimiter=';')
-        rows = list(reader)
+    rows = read_csv(csv_file).to_dict('records')
 
     return calculate_averages(rows)
 
@@ -55,7 +59,7 @@ def distribution(values, average, type: str):
     return
 
 def plot_distribution(csv_file, type):
-    df = pd.read_csv(csv_file)
+    df = read_csv(csv_file)
     
     frequency = df['frequency']
     deviation = df['deviation']
@@ -69,24 +73,13 @@ def plot_distribution(csv_file, type):
     plt.show()
 
 def moving_averages(csv_file):
-    rolling_averages = {}
-
-    df = pd.read_csv(csv_file, sep=';')
-    for i in range(5, len(df)):  # Start from 5th row to avoid index out of range
-        selected_rows = df.loc[i-5:i]
-
-        bid_prices = selected_rows['bid_price_1']
-        ask_prices = selected_rows['ask_price_1']
-        bid_volumes = selected_rows['bid_volume_1']
-        ask_volumes = selected_rows['ask_volume_1']
-        
-        # Calculating volume-weighted average bid and ask prices
-        vwap = ((bid_prices * bid_volumes).sum() + (ask_prices * ask_volumes).sum())  / (bid_volumes.sum() + ask_volumes.sum())
+    df = read_csv(csv_file)
 
-        timestamp = selected_rows['timestamp'].iloc[-1]  # Taking the timestamp of the last row
-        rolling_averages[timestamp] = vwap
+    # Volume-weighted average of the bid and ask levels over each row and the 5 before it, from rolling sums
+    vwap, _, _ = book_vwaps(df['bid_price_1'], df['bid_volume_1'], df['ask_price_1'], df['ask_volume_1'], 6)
 
-    return rolling_averages
+    # Start from 5th row as the windows always have
+    return dict(zip(df['timestamp'].tolist()[5:], vwap[5:].tolist()))
 
 def plot_ma(roll_avg):
 
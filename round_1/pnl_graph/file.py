@@ -25,9 +25,10 @@ def createStarandAmyCSV(input_csv, amethysts_csv, starfruit_csv):
         writer.writeheader()
         writer.writerows(starfruit_data)
 
-# Example usage
-input_csv_path = 'historical_data.csv'           
-amethysts_csv_path = 'amethysts_data.csv'   
-starfruit_csv_path = 'starfruit_data.csv'   
+# Example usage. Scripts no longer need the split copies, backtester.cache.read_product reads a product's rows directly
+if __name__ == "__main__":
+    input_csv_path = 'historical_data.csv'
+    amethysts_csv_path = 'amethysts_data.csv'
+    starfruit_csv_path = 'starfruit_data.csv'
 
-createStarandAmyCSV(input_csv_path, amethysts_csv_path, starfruit_csv_path)
\ No newline at end of file
+    createStarandAmyCSV(input_csv_path, amethysts_csv_path, starfruit_csv_path)
\ No newline at end of file
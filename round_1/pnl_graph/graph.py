@@ -1,29 +1,30 @@
 import csv
+import os
+import sys
 import pyqtgraph as pg
 from PyQt5.QtGui import QFont, QColor
 from PyQt5.QtWidgets import QApplication
 import pandas as pd
-from file import createStarandAmyCSV
 import numpy as np
 
+# First on the path, so the backtester imports the repo's datamodel rather than the one in this directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from backtester.cache import load_table, load_product, read_product
+from indicators import book_vwaps, ema
+from decimation import plot_pyqtgraph
 
-def extract_data(csv_file):
-    timestamps = []
-    avg_price = []
-    pnl = []
 
-    with open(csv_file, 'r') as file:
-        reader = csv.DictReader(file, delimiter=';')
-        for row in reader:
-            timestamp = int(row['timestamp'])
-            avg = ((float(row['bid_price_1']) * float(row['bid_volume_1']) + float(row['ask_price_1']) * float(row['ask_volume_1'])) /
-                   (float(row['bid_volume_1']) + float(row['ask_volume_1'])))
-            
-            timestamps.append(timestamp)
-            avg_price.append(avg)
-            pnl.append(float(row['profit_and_loss']))
+def extract_data(csv_file, product):
+    table = load_product(csv_file, product)
+
+    bid_price = table['bid_price_1'].astype(np.float64)
+    ask_price = table['ask_price_1'].astype(np.float64)
+    bid_volume = table['bid_volume_1'].astype(np.float64)
+    ask_volume = table['ask_volume_1'].astype(np.float64)
 
-    return timestamps, avg_price
+    avg_price = (bid_price * bid_volume + ask_price * ask_volume) / (bid_volume + ask_volume)
+
+    return table['timestamp'].tolist(), avg_price.tolist()
 
 def calculate_ema(mid_prices):
     """
@@ -36,84 +37,34 @@ def calculate_ema(mid_prices):
     - emas (list): List of EMAs corresponding to the input prices.
     """
 
-    mid_price_vals = list(mid_prices.values())
-
     if len(mid_prices) < 2:
         raise ValueError("List must contain at least two values to calculate EMA.")
 
-    emas = [mid_price_vals[0]]  # EMA for the first value is the value itself
-    
-    alpha = 0.1
-
-    for i in range(1, len(mid_price_vals)):
-        mid_price = mid_price_vals[i]
-        ema = mid_price * alpha + (1 - alpha) * emas[-1]
-        emas.append(ema)
-
-    return emas
-
-def get_mid_prices(csv_file):
-    
-    mid_prices = {}
-
-    with open(csv_file, 'r') as file:
-        reader = csv.DictReader(file, delimiter=';')
-        for row in reader:
-            time = int(row['timestamp'])
-
-            bid_price = float(row['bid_price_1'])
-            ask_price = float(row['ask_price_1'])
-            bid_volume = float(row['bid_volume_1'])
-            ask_volume = float(row['ask_volume_1'])
-
-            vwap = ((bid_price * bid_volume) + (ask_price * ask_volume))  / (bid_volume + ask_volume)
+    # The EMA for the first value is the value itself
+    return ema(list(mid_prices.values()), 0.1).tolist()
 
-            mid_prices[time] = vwap
+def get_mid_prices(csv_file, product):
+    timestamps, vwaps = extract_data(csv_file, product)
 
-    return mid_prices
+    return dict(zip(timestamps, vwaps))
 
-def moving_averages(csv_file, j):
-    rolling_averages = {}
+def rolling_vwaps(csv_file, product, j):
+    """Return the timestamps from the 5th row on and the VWAPs of both sides, the bids and the asks over each row and the j rows before it."""
+    df = read_product(csv_file, product)
 
-    df = pd.read_csv(csv_file, sep=';')
-    for i in range(5, len(df)):  # Start from 5th row to avoid index out of range
-        selected_rows = df.loc[i-j:i]
+    # Rolling sums of the level 1 notionals and volumes in O(n), rather than re-summing every window
+    vwaps = book_vwaps(df['bid_price_1'], df['bid_volume_1'], df['ask_price_1'], df['ask_volume_1'], j + 1)
 
-        bid_prices = selected_rows['bid_price_1']
-        ask_prices = selected_rows['ask_price_1']
-        bid_volumes = selected_rows['bid_volume_1']
-        ask_volumes = selected_rows['ask_volume_1']
+    # Start from 5th row as the windows always have
+    return df['timestamp'].tolist()[5:], [vwap[5:].tolist() for vwap in vwaps]
 
-        # Calculating volume-weighted average bid and ask prices
-        vwap = ((bid_prices * bid_volumes).sum() + (ask_prices * ask_volumes).sum())  / (bid_volumes.sum() + ask_volumes.sum())
+def moving_averages(csv_file, product, j):
+    timestamps, (vwap, _, _) = rolling_vwaps(csv_file, product, j)
+    return dict(zip(timestamps, vwap))
 
-        timestamp = selected_rows['timestamp'].iloc[-1]  # Taking the timestamp of the last row
-        rolling_averages[timestamp] = vwap
-
-    return rolling_averages
-
-def moving_averages_bid_ask(csv_file, j):
-    rolling_averages_bid = {}
-    rolling_averages_ask = {}
-
-    df = pd.read_csv(csv_file, sep=';')
-    for i in range(5, len(df)):  # Start from 5th row to avoid index out of range
-        selected_rows = df.loc[i-j:i]
-
-        bid_prices = selected_rows['bid_price_1']
-        ask_prices = selected_rows['ask_price_1']
-        bid_volumes = selected_rows['bid_volume_1']
-        ask_volumes = selected_rows['ask_volume_1']
-
-        # Calculating volume-weighted average bid and ask prices
-        vwap_bid = (bid_prices * bid_volumes).sum() / bid_volumes.sum()
-        vwap_ask = (ask_prices * ask_volumes).sum() / ask_volumes.sum()
-
-        timestamp = selected_rows['timestamp'].iloc[-1]  # Taking the timestamp of the last row
-        rolling_averages_bid[timestamp] = vwap_bid
-        rolling_averages_ask[timestamp] = vwap_ask
-
-    return rolling_averages_bid, rolling_averages_ask
+def moving_averages_bid_ask(csv_file, product, j):
+    timestamps, (_, vwap_bid, vwap_ask) = rolling_vwaps(csv_file, product, j)
+    return dict(zip(timestamps, vwap_bid)), dict(zip(timestamps, vwap_ask))
 
 def extract_trades(csv_file, mid_prices):
     trades_under = {}
@@ -137,68 +88,44 @@ def extract_trades(csv_file, mid_prices):
     return trades_under, trades_over
 
 def extract_results(csv_file):
-    starfruit_pnl = []
-    starfruit_positions = []
-    amethyst_pnl = []
-    amethyst_positions = []
+    table = load_table(csv_file)
 
-    with open(csv_file, 'r') as file:
-        reader = csv.DictReader(file, delimiter=',')
-        for row in reader:
-            starfruit_pnl.append(float(row['starfruit_pnl']))
-            starfruit_positions.append(float(row['starfruit_positions']))
-            amethyst_pnl.append(float(row['amethyst_pnl']))
-            amethyst_positions.append(float(row['amethyst_positions']))
+    starfruit_pnl = table['starfruit_pnl'].astype(np.float64).tolist()
+    starfruit_positions = table['starfruit_positions'].astype(np.float64).tolist()
+    amethyst_pnl = table['amethyst_pnl'].astype(np.float64).tolist()
+    amethyst_positions = table['amethyst_positions'].astype(np.float64).tolist()
 
     return starfruit_pnl, starfruit_positions, amethyst_pnl, amethyst_positions
 
 def orchid_results(csv_file):
-    timestamp = []
-    orchids = []
-    transport_fees = []
-    export_tariff = []
-    import_tariff = []
-    sunlight = []
-    humidity = []
+    table = load_table(csv_file)
 
-    with open(csv_file, 'r') as file:
-        reader = csv.DictReader(file, delimiter=',')
-        for row in reader:
-            timestamp.append(float(row['timestamp']))
-            orchids.append(float(row['ORCHIDS']))
-            transport_fees.append(float(row['TRANSPORT_FEES']))
-            export_tariff.append(float(row['EXPORT_TARIFF']))
-            import_tariff.append(float(row['IMPORT_TARIFF']))
-            sunlight.append(float(row['SUNLIGHT']))
-            humidity.append(float(row['HUMIDITY']))
+    columns = ['timestamp', 'ORCHIDS', 'TRANSPORT_FEES', 'EXPORT_TARIFF', 'IMPORT_TARIFF', 'SUNLIGHT', 'HUMIDITY']
+    timestamp, orchids, transport_fees, export_tariff, import_tariff, sunlight, humidity = [table[column].astype(np.float64).tolist() for column in columns]
 
     return timestamp, orchids,transport_fees, export_tariff, import_tariff, sunlight, humidity
             
 
 oldDataPath = "historical_data.csv"
-amethystPath = 'amethysts_data.csv'   
-starfruitPath = 'starfruit_data.csv'  
 newDataPath = "additional.csv"
 
 orchid_path = "orchid_data.csv"
 
-createStarandAmyCSV(oldDataPath, amethystPath, starfruitPath)
-
-# Extract and create amethyst and starfruit csv from results.csv
-"""extractedStarData = moving_averages(starfruitPath, 1500)
-furtherStarData = moving_averages(starfruitPath, 500)"""
+# Amethyst and starfruit rows are read straight from the historical data through its product index
+"""extractedStarData = moving_averages(oldDataPath, 'STARFRUIT', 1500)
+furtherStarData = moving_averages(oldDataPath, 'STARFRUIT', 500)"""
 
-extractedStarData, x = moving_averages_bid_ask(starfruitPath, 4500)
-y, furtherStarData = moving_averages_bid_ask(starfruitPath, 500)
+extractedStarData, x = moving_averages_bid_ask(oldDataPath, 'STARFRUIT', 4500)
+y, furtherStarData = moving_averages_bid_ask(oldDataPath, 'STARFRUIT', 500)
 
-extractedAmyData = moving_averages(amethystPath, 900)
+extractedAmyData = moving_averages(oldDataPath, 'AMETHYSTS', 900)
 
-timestamps_amethyst, avg_price_amethyst = extract_data(amethystPath)
-timestamps_starfruit, avg_price_starfruit = extract_data(starfruitPath)
+timestamps_amethyst, avg_price_amethyst = extract_data(oldDataPath, 'AMETHYSTS')
+timestamps_starfruit, avg_price_starfruit = extract_data(oldDataPath, 'STARFRUIT')
 
 pnl_starfruit, position_starfruit, pnl_amethyst, position_amethyst = extract_results(newDataPath)
 
-mid_prices =get_mid_prices(starfruitPath)
+mid_prices =get_mid_prices(oldDataPath, 'STARFRUIT')
 
 #trades_under, trades_over = extract_trades('Cleaned_final_starfruit_data_trades.csv', mid_prices)
 
@@ -213,7 +140,7 @@ win = pg.GraphicsLayoutWidget()
 plot_avg_price_amethyst = win.addPlot()
 plot_avg_price_amethyst.setLabel('left', 'Price', color='black', **{'font-size': '14pt'})
 plot_avg_price_amethyst.setLabel('bottom', 'Timestamp', color='black', **{'font-size': '14pt'})
-original_amy = plot_avg_price_amethyst.plot(timestamps_amethyst, avg_price_amethyst, pen={'color': 'b', 'width': 3}, name='Original')
+original_amy = plot_pyqtgraph(plot_avg_price_amethyst, timestamps_amethyst, avg_price_amethyst, pen={'color': 'b', 'width': 3}, name='Original')
 plot_avg_price_amethyst.setTitle(title="<span style='font-size: 18pt;'>Amethyst Volume Weighted Average Prices</span>", color='black')
 legend_amy = plot_avg_price_amethyst.addLegend()
 
@@ -221,14 +148,14 @@ legend_amy = plot_avg_price_amethyst.addLegend()
 plot_pnl_amethyst = win.addPlot(row=1, col=0)
 plot_pnl_amethyst.setLabel('left', 'PnL', color='black', **{'font-size': '14pt'})
 plot_pnl_amethyst.setLabel('bottom', 'Timestamp', color='black', **{'font-size': '14pt'})
-plot_pnl_amethyst.plot(timestamps_amethyst, pnl_amethyst, pen={'color': 'g', 'width': 3})
+plot_pyqtgraph(plot_pnl_amethyst, timestamps_amethyst, pnl_amethyst, pen={'color': 'g', 'width': 3})
 plot_pnl_amethyst.setTitle(title="<span style='font-size: 18pt;'>Amethyst PnL</span>", color='black')
 
 # Third plot for starfruit average prices
 plot_avg_price_starfruit = win.addPlot(row=0, col=1)
 plot_avg_price_starfruit.setLabel('left', 'Price', color='black', **{'font-size': '14pt'})
 plot_avg_price_starfruit.setLabel('bottom', 'Timestamp', color='black', **{'font-size': '14pt'})
-original_starfruit = plot_avg_price_starfruit.plot(timestamps_starfruit, avg_price_starfruit, pen={'color': 'b', 'width': 3}, name='Original')
+original_starfruit = plot_pyqtgraph(plot_avg_price_starfruit, timestamps_starfruit, avg_price_starfruit, pen={'color': 'b', 'width': 3}, name='Original')
 #moving_avg_starfruit_900 = plot_avg_price_starfruit.plot(list(extractedStarData.keys()), list(extractedStarData.values()), pen={'color': 'r', 'width': 3}, name='900 Moving Average')
 #moving_avg_starfruit_300 = plot_avg_price_starfruit.plot(list(furtherStarData.keys()), list(furtherStarData.values()), pen={'color': 'g', 'width': 3}, name='300 Moving Average')
 #manual_trades_plot_under = plot_avg_price_starfruit.plot(list(trades_under.keys()), list(trades_under.values()), pen={'color': 'r', 'width': 3}, name='300 Moving Average')
@@ -242,7 +169,7 @@ legend_starfruit = plot_avg_price_starfruit.addLegend()
 plot_pnl_starfruit = win.addPlot(row=1, col=1)
 plot_pnl_starfruit.setLabel('left', 'PnL', color='black', **{'font-size': '14pt'})
 plot_pnl_starfruit.setLabel('bottom', 'Timestamp', color='black', **{'font-size': '14pt'})
-plot_pnl_starfruit.plot(timestamps_starfruit, pnl_starfruit, pen={'color': 'g', 'width': 3})
+plot_pyqtgraph(plot_pnl_starfruit, timestamps_starfruit, pnl_starfruit, pen={'color': 'g', 'width': 3})
 plot_pnl_starfruit.setTitle(title="<span style='font-size: 18pt;'>Starfruit PnL</span>", color='black')
 
 
@@ -250,14 +177,14 @@ plot_pnl_starfruit.setTitle(title="<span style='font-size: 18pt;'>Starfruit PnL<
 plot_positions_amethyst = win.addPlot(row=2, col=0)
 plot_positions_amethyst.setLabel('left', 'Position', color='black', **{'font-size': '14pt'})
 plot_positions_amethyst.setLabel('bottom', 'Timestamp', color='black', **{'font-size': '14pt'})
-plot_positions_amethyst.plot(timestamps_amethyst, position_amethyst, pen={'color': 'm', 'width': 3})
+plot_pyqtgraph(plot_positions_amethyst, timestamps_amethyst, position_amethyst, pen={'color': 'm', 'width': 3})
 plot_positions_amethyst.setTitle(title="<span style='font-size: 18pt;'>Amethyst Positions</span>", color='black')
 
 # Sixth plot for starfruit positions
 plot_positions_starfruit = win.addPlot(row=2, col=1)
 plot_positions_starfruit.setLabel('left', 'Position', color='black', **{'font-size': '14pt'})
 plot_positions_starfruit.setLabel('bottom', 'Timestamp', color='black', **{'font-size': '14pt'})
-plot_positions_starfruit.plot(timestamps_starfruit, position_starfruit, pen={'color': 'm', 'width': 3})
+plot_pyqtgraph(plot_positions_starfruit, timestamps_starfruit, position_starfruit, pen={'color': 'm', 'width': 3})
 plot_positions_starfruit.setTitle(title="<span style='font-size: 18pt;'>Starfruit Positions</span>", color='black')
 
 # Set background to white
@@ -1,12 +1,15 @@
+import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 
-# Step 2: Load the data
-data = pd.read_csv("test_orchid.csv", delimiter=';')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from backtester.cache import read_product
 
+# Step 2: Load the data
 # Step 3: Prepare data for plotting
 # Assuming you want to plot bid price 1 and ask price 1 against time for the product "ORCHIDS"
-orchid_data = data[data['product'] == 'ORCHIDS']
+orchid_data = read_product("test_orchid.csv", 'ORCHIDS')
 timestamps = orchid_data['timestamp']
 bid_price_1 = orchid_data['bid_price_1']
 ask_price_1 = orchid_data['ask_price_1']
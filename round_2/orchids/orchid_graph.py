@@ -1,19 +1,16 @@
-import csv
+import os
+import sys
+import numpy as np
 import plotly.graph_objects as go
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from backtester.cache import load_table
+from decimation import minmax, DEFAULT_PIXELS
+
 def orchid_results(csv_file):
-    timestamp = []
-    orchids = []
-    sunlight = []
-    humidity = []
-
-    with open(csv_file, 'r') as file:
-        reader = csv.DictReader(file, delimiter=';')
-        for row in reader:
-            timestamp.append(float(row['timestamp']))
-            orchids.append(float(row['ORCHIDS']))
-            sunlight.append(float(row['SUNLIGHT']))
-            humidity.append(float(row['HUMIDITY']))
+    table = load_table(csv_file)
+
+    timestamp, orchids, sunlight, humidity = [table[column].astype(np.float64).tolist() for column in ['timestamp', 'ORCHIDS', 'SUNLIGHT', 'HUMIDITY']]
 
     return timestamp, orchids, sunlight, humidity
 
@@ -28,16 +25,19 @@ timestamp_1, orchids_1, sunlight_1, humidity_1 = orchid_results(orchid_path_1)
 timestamp_2, orchids_2, sunlight_2, humidity_2 = orchid_results(orchid_path_2)
 
 
+# Keep the highest and lowest point per screen pixel so the figure stays light without losing any peaks
+decimated = {name: minmax(timestamp_2, values, DEFAULT_PIXELS) for name, values in (('Orchids', orchids_2), ('Sunlight', sunlight_2), ('Humidity', humidity_2))}
+
 fig = go.Figure()
 
 # Plot y1
-fig.add_trace(go.Scatter(x=timestamp_2, y=orchids_2, mode='lines', name='Orchids'))
+fig.add_trace(go.Scatter(x=decimated['Orchids'][0], y=decimated['Orchids'][1], mode='lines', name='Orchids'))
 
 # Plot y2
-fig.add_trace(go.Scatter(x=timestamp_2, y=sunlight_2, mode='lines', name='Sunlight', yaxis='y2'))
+fig.add_trace(go.Scatter(x=decimated['Sunlight'][0], y=decimated['Sunlight'][1], mode='lines', name='Sunlight', yaxis='y2'))
 
 # Plot y3
-fig.add_trace(go.Scatter(x=timestamp_2, y=humidity_2, mode='lines', name='Humidity', yaxis='y3'))
+fig.add_trace(go.Scatter(x=decimated['Humidity'][0], y=decimated['Humidity'][1], mode='lines', name='Humidity', yaxis='y3'))
 
 # Update layout
 fig.update_layout(
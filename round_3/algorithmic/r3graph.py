@@ -1,8 +1,14 @@
+import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy.stats import norm
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from backtester.cache import read_csv, read_product
+from basket import replay_trades
+
 
 z = 0.5
 percent = (norm.cdf(z) - 0.5) 
@@ -10,16 +16,17 @@ print(percent)
 
 hello = 6 + 4 * 1.9656933442176188 + 3.6026796488094828
 
-df = pd.read_csv("r3_data.csv", delimiter=',')
-
-# Calculate midprice for each asset
-df['midprice'] = (df['bid_price_1'] + df['ask_price_1']) / 2
+# Running mean, std and z-score of the basket spread over the recorded trade history
+spread_history = pd.DataFrame(replay_trades([f"round3day{day}.csv" for day in range(3)]))
+print(spread_history.groupby('day')['spread'].agg(['mean', 'std']))
+print("Spread mean:", spread_history['mean'].iloc[-1], "std:", spread_history['std'].iloc[-1])
 
-# Filter data for each asset
-strawberries = df[df['product'] == 'STRAWBERRIES'][['timestamp', 'bid_price_1', 'ask_price_1']]
-chocolate = df[df['product'] == 'CHOCOLATE'][['timestamp', 'bid_price_1', 'ask_price_1']]
-roses = df[df['product'] == 'ROSES'][['timestamp', 'bid_price_1', 'ask_price_1']]
-gift_basket = df[df['product'] == 'GIFT_BASKET'][['timestamp', 'bid_price_1', 'ask_price_1']]
+# Read the rows of each asset through the product index of the file
+columns = ['timestamp', 'bid_price_1', 'ask_price_1']
+strawberries = read_product("r3_data.csv", 'STRAWBERRIES', columns=columns)
+chocolate = read_product("r3_data.csv", 'CHOCOLATE', columns=columns)
+roses = read_product("r3_data.csv", 'ROSES', columns=columns)
+gift_basket = read_product("r3_data.csv", 'GIFT_BASKET', columns=columns)
 
 # Merge data frames based on timestamp with left join
 merged_df = strawberries.merge(chocolate, on='timestamp', suffixes=('_straweberries', '_chocolate'), how='left')
@@ -50,10 +57,10 @@ modified_ask_price = merged_df['bid_price_1_straweberries'] - (merged_df['ask_pr
 
 print(np.std(modified_ask_price))
 
-df2 = pd.read_csv("DATASELL.csv", delimiter=',')
+df2 = read_csv("DATASELL.csv")
 print(df2)
 
-df3 = pd.read_csv("DATABUY.csv", delimiter=',')
+df3 = read_csv("DATABUY.csv")
 
 # Plotting
 plt.figure(figsize=(10, 6))
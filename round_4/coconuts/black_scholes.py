@@ -1,20 +1,23 @@
 import re
+import os
+import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.stats import norm
-import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from backtester.cache import read_product
+from pricing import call_price as black_scholes_call_price, implied_vol
+from decimation import plot_matplotlib
 
 STRIKE = 10000
 RF = -0.052855941708912724
 VOL = 0.24086532541788852
 EXPIRY = 250/365
 
-df = pd.read_csv("r4_data.csv", delimiter=',')
-
-# Separate data for COCONUT and COCONUT_COUPON
-coconut_data = df[df['product'] == 'COCONUT']
-coconut_coupon_data = df[df['product'] == 'COCONUT_COUPON']
+# Read COCONUT and COCONUT_COUPON separately through the product index of the file
+coconut_data = read_product("r4_data.csv", 'COCONUT')
+coconut_coupon_data = read_product("r4_data.csv", 'COCONUT_COUPON')
 
 # Merge the two DataFrames on the 'timestamp' column
 merged_df = pd.merge(coconut_data[['timestamp', 'mid_price']], coconut_coupon_data[['timestamp', 'mid_price']], on='timestamp', suffixes=('_coconut', '_coconut_coupon'))
@@ -29,10 +32,7 @@ volatility = np.sqrt((1 / (log_returns_coconut_length - 1)) * log_returns_coconu
 annual_vol = volatility / (np.sqrt(1/(10000 * 365)))
 
 def black_scholes_call(S):
-    d1 = (np.log(S / STRIKE) + (RF + 0.5 * VOL**2) * EXPIRY) / (VOL * np.sqrt(EXPIRY))
-    d2 = d1 - VOL * np.sqrt(EXPIRY)
-    call_price = S * norm.cdf(d1) - STRIKE * np.exp(-RF * EXPIRY) * norm.cdf(d2)
-    return call_price
+    return black_scholes_call_price(S, STRIKE, EXPIRY, RF, VOL)
 
 # Given data
 S = 10000
@@ -46,19 +46,23 @@ call_price = black_scholes_call(S)
 
 # Calculate call option price for each mid_price_coupon
 merged_df['call_option_price'] = black_scholes_call(merged_df['mid_price_coconut'])
+
+# Invert every coupon mid price into its implied volatility in one vectorized pass
+merged_df['implied_vol'] = implied_vol(merged_df['mid_price_coconut_coupon'], merged_df['mid_price_coconut'], STRIKE, EXPIRY, RF)
+print("Fitted volatility:", VOL, "mean implied volatility:", merged_df['implied_vol'].mean())
 # Create subplots
 fig, axs = plt.subplots(2, 1, figsize=(10, 8))
 
 # Plot mid_price_coupon and call_option_price separately
-axs[0].plot(merged_df['timestamp'], merged_df['mid_price_coconut_coupon'] - merged_df['call_option_price'], label='price difference - black scholes (profit opportunities)', color='blue')
+plot_matplotlib(axs[0], merged_df['timestamp'], merged_df['mid_price_coconut_coupon'] - merged_df['call_option_price'], label='price difference - black scholes (profit opportunities)', color='blue')
 axs[0].set_ylabel('Price')
 axs[0].set_title('Mid Price Coupon over Time')
 axs[0].legend()
 axs[0].grid(True)
 
 # Plot mid_price_coupon and call_option_price separately
-axs[1].plot(merged_df['timestamp'], merged_df['mid_price_coconut_coupon'], label='Mid Price Coupon', color='red')
-axs[1].plot(merged_df['timestamp'], merged_df['call_option_price'], label='Black-Scholes Call Option Price', color='blue')
+plot_matplotlib(axs[1], merged_df['timestamp'], merged_df['mid_price_coconut_coupon'], label='Mid Price Coupon', color='red')
+plot_matplotlib(axs[1], merged_df['timestamp'], merged_df['call_option_price'], label='Black-Scholes Call Option Price', color='blue')
 axs[1].set_xlabel('Timestamp')
 axs[1].set_ylabel('Price')
 axs[1].set_title('Black-Scholes Call Option Price over Time')
@@ -1,14 +1,18 @@
 import re
+import os
+import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.stats import norm
 
-df = pd.read_csv("r4_data.csv", delimiter=',')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from backtester.cache import read_csv, read_product
+from pricing import call_price, put_price
+from decimation import plot_matplotlib
 
-# Separate data for COCONUT and COCONUT_COUPON
-coconut_data = df[df['product'] == 'COCONUT']
-coconut_coupon_data = df[df['product'] == 'COCONUT_COUPON']
+# Read COCONUT and COCONUT_COUPON separately through the product index of the file
+coconut_data = read_product("r4_data.csv", 'COCONUT')
+coconut_coupon_data = read_product("r4_data.csv", 'COCONUT_COUPON')
 
 # Merge the two DataFrames on the 'timestamp' column
 merged_df = pd.merge(coconut_data[['timestamp', 'mid_price']], coconut_coupon_data[['timestamp', 'mid_price']], on='timestamp', suffixes=('_coconut', '_coconut_coupon'))
@@ -38,7 +42,7 @@ merged_df['gamma'] = (merged_df['delta'] - merged_df['delta'].shift(50)) / (merg
 
 # Plotting Coconut midprice against time
 plt.figure(figsize=(10, 6))
-plt.plot(coconut_data['timestamp'], merged_df['coconut_price_change_50'], label='COCONUT', marker='o')
+plot_matplotlib(plt.gca(), coconut_data['timestamp'], merged_df['coconut_price_change_50'], label='COCONUT', marker='o')
 plt.xlabel('Timestamp')
 plt.ylabel('price change sensitivity')
 plt.title('Coconut Price Change Sensitivity (50 timestamps ago)')
@@ -50,7 +54,7 @@ sensitivity_50 = merged_df['coupon_price_change_50'] / merged_df['coconut_price_
 
 # Plotting Coconut midprice sensitivity against time
 plt.figure(figsize=(10, 6))
-plt.plot(coconut_data['timestamp'], merged_df['coupon_price_change_50'], label='COCONUT', marker='o')
+plot_matplotlib(plt.gca(), coconut_data['timestamp'], merged_df['coupon_price_change_50'], label='COCONUT', marker='o')
 plt.xlabel('Timestamp')
 plt.ylabel('price change')
 plt.title('coupon Price Change Sensitivity (50 timestamps ago)')
@@ -69,18 +73,18 @@ pd.set_option('display.max_columns', None)
 fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 8))
 
 # Plotting sensitivity_50 in the first subplot
-ax1.plot(coconut_data['timestamp'], merged_df['gamma'], label='Delta (COCONUT / COCONUT_COUPON)')
+plot_matplotlib(ax1, coconut_data['timestamp'], merged_df['gamma'], label='Delta (COCONUT / COCONUT_COUPON)')
 ax1.set_xlabel('Timestamp')
 ax1.set_ylabel('Delta (COCONUT / COCONUT_COUPON)')
 ax1.set_title('Delta (50 timestamps ago)')
 ax1.legend(loc='upper left')
 ax1.grid(True)
 
-df1 = pd.read_csv("DATASELL.csv", delimiter=',')
-df2 = pd.read_csv('DATABUY.csv', delimiter=',')
+df1 = read_csv("DATASELL.csv")
+df2 = read_csv('DATABUY.csv')
 
 # Plotting mid price of coupons and mid price of COCONUT in the second subplot
-ax2.plot(coconut_data['timestamp'], merged_df['mid_price_coconut_coupon'], color='red', label='Mid Price of Coupons')
+plot_matplotlib(ax2, coconut_data['timestamp'], merged_df['mid_price_coconut_coupon'], color='red', label='Mid Price of Coupons')
 ax3.plot(df1['timestamp'], df1['price'], label='Sell', color='red', marker='o')
 ax3.plot(df2['timestamp'], df2['price'], label='Buy', color='green', marker='o')
 ax2.set_xlabel('Timestamp')
@@ -88,7 +92,7 @@ ax2.set_ylabel('Mid Price')
 ax2.legend(loc='upper right')
 ax2.grid(True)
 
-ax3.plot(coconut_data['timestamp'], merged_df['mid_price_coconut'], color='blue', label='Mid Price of Coconuts')
+plot_matplotlib(ax3, coconut_data['timestamp'], merged_df['mid_price_coconut'], color='blue', label='Mid Price of Coconuts')
 ax3.set_xlabel('Timestamp')
 ax3.set_ylabel('Mid Price')
 ax3.legend(loc='upper right')
@@ -126,11 +130,7 @@ coconut_coupon_volatility = np.std(merged_df['coupon_return']) * np.sqrt(250)  #
 
 # Step 3: Black-Scholes calculation
 def black_scholes(S, K, T, r, sigma):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    call_price = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-    put_price = K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-    return call_price, put_price
+    return call_price(S, K, T, r, sigma), put_price(S, K, T, r, sigma)
 
 # Parameters
 strike_price = 10000
@@ -145,8 +145,8 @@ coconut_call_price, _ = black_scholes(merged_df['mid_price_coconut'], strike_pri
 
 # Visualize results
 plt.figure(figsize=(10, 6))
-plt.plot(merged_df['timestamp'], coconut_call_price, label='Estimated Call Option Price')
-plt.plot(merged_df['timestamp'], merged_df['mid_price_coconut_coupon'], label='Actual Coconut Option Mid Price')
+plot_matplotlib(plt.gca(), merged_df['timestamp'], coconut_call_price, label='Estimated Call Option Price')
+plot_matplotlib(plt.gca(), merged_df['timestamp'], merged_df['mid_price_coconut_coupon'], label='Actual Coconut Option Mid Price')
 plt.xlabel('Timestamp')
 plt.ylabel('Option Price')
 plt.title('Black-Scholes Estimated vs. Actual Coconut Option Mid Price')
@@ -1,10 +1,15 @@
+import os
+import sys
 import tkinter as tk
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from backtester.cache import read_csv
+
 # Assuming you have the data stored in a CSV file named 'trades.csv'
-df = pd.read_csv('pnl_output_per.csv')
+df = read_csv('pnl_output_per.csv')
 
 def create_gui(root):
     # Group the data by 'Symbol'
@@ -1,29 +1,12 @@
-import csv
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk
 
-trader_trades = {
-    'Valentina': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Vinnie': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Vladimir': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Vivian': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Celeste': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Colin': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Carlos': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Camilla': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Pablo': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Penelope': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Percy': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Petunia': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Ruby': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Remy': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Rhianna': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Raj': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Amelia': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Adam': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Alina': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}},
-    'Amir': {'STARFRUIT': {}, 'AMETHYSTS': {}, 'GIFT_BASKET': {}, 'ROSES': {}, 'CHOCOLATE': {}, 'STRAWBERRIES': {}, 'COCONUT_COUPON': {}, 'COCONUT': {}}
-}
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from backtester.attribution import attribute
+
+trade_files = ['r5_trades_r1.csv', 'r5_trades_r3.csv', 'r5_trades_r4.csv']
 
 symbol_closings = {
     'STARFRUIT': {'bid': 5048, 'ask': 5054},
@@ -36,90 +19,39 @@ symbol_closings = {
     'COCONUT': {'bid': 9882, 'ask': 9883}
 }
 
-def read_trades(file_name):
-    with open(file_name, newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            trader = row['buyer']
-            seller = row['seller']
-            symbol = row['symbol']
-            price = float(row['price'])
-            quantity = int(row['quantity'])
-
-            if trader in trader_trades:
-                if symbol in trader_trades[trader]:
-                    if price in trader_trades[trader][symbol]:
-                        trader_trades[trader][symbol][price] += quantity
-                    else:
-                        trader_trades[trader][symbol][price] = quantity
-                else:
-                    trader_trades[trader][symbol] = {price: quantity}
-            else:
-                trader_trades[trader] = {symbol: {price: quantity}}
-
-            if seller in trader_trades:
-                if symbol in trader_trades[seller]:
-                    if price in trader_trades[seller][symbol]:
-                        trader_trades[seller][symbol][price] -= quantity
-                    else:
-                        trader_trades[seller][symbol][price] = -quantity
-                else:
-                    trader_trades[seller][symbol] = {price: -quantity}
-            else:
-                trader_trades[seller] = {symbol: {price: -quantity}}
+def calculate_pnl(file_names):
+    # Traders and symbols are taken from the trades, open positions are marked at the closing ask if long and bid if short
+    closings = {symbol: (prices['bid'], prices['ask']) for symbol, prices in symbol_closings.items()}
+    return attribute(file_names, closings)
 
-def calculate_pnl(symbol, trader_trades):
-    pnl_data = {}
-    for trader, trades in trader_trades.items():
-        pnl = 0
-        for trade_symbol, transactions in trades.items():
-            for price, quantity in transactions.items():
-                if trade_symbol == symbol:
-                    pnl += price * -quantity
-
-        if (sum(trades[symbol].values())) > 0:
-            pnl += (symbol_closings[symbol]['ask'] * (sum(trades[symbol].values())))
-        elif (sum(trades[symbol].values())) < 0:
-            pnl += (symbol_closings[symbol]['bid'] * (sum(trades[symbol].values())))
-
-        pnl_data[trader] = pnl
-    return pnl_data
-
-def print_pnl_table(all_pnl, window):
+def print_pnl_table(table, window):
     pnl_window = tk.Toplevel(window)
     pnl_window.title("PnL Table")
 
     tree = ttk.Treeview(pnl_window)
 
-    tree["columns"] = tuple(all_pnl['STARFRUIT'].keys())
+    tree["columns"] = tuple(table.columns)
 
     tree.heading("#0", text="Trader")
     for col in tree["columns"]:
         tree.heading(col, text=col)
 
-    for trader, pnl_data in all_pnl.items():
-        tree.insert("", "end", text=trader, values=tuple(pnl_data.values()))
+    for trader, pnl_data in table.iterrows():
+        tree.insert("", "end", text=trader, values=tuple(round(pnl) for pnl in pnl_data))
 
     tree.pack(expand=True, fill="both")
 
 def main():
-    read_trades('r5_trades_r1.csv')
-    all_pnl = {}
-    print(trader_trades)
-    all_pnl['STARFRUIT'] = calculate_pnl('STARFRUIT', trader_trades)
-    all_pnl['AMETHYSTS'] = calculate_pnl('AMETHYSTS', trader_trades)
-
-    read_trades('r5_trades_r3.csv')
-    all_pnl['ROSES'] = calculate_pnl('ROSES', trader_trades)
-    all_pnl['STRAWBERRIES'] = calculate_pnl('STRAWBERRIES', trader_trades)
-    all_pnl['GIFT_BBASKET'] = calculate_pnl('GIFT_BASKET', trader_trades)
-    all_pnl['CHOCOLATE'] = calculate_pnl('CHOCOLATE', trader_trades)
+    attribution = calculate_pnl(trade_files)
 
-    read_trades('r5_trades_r4.csv')
-    all_pnl['COCONUT_COUPON'] = calculate_pnl('COCONUT_COUPON', trader_trades)
-    all_pnl['COCONUT'] = calculate_pnl('COCONUT', trader_trades)
+    # Each row is a trader's cash and marked position against one counterparty, with no rows of a trader
+    # against themselves. The older pnl_output_per.csv that graph_pnls.py reads was made differently, so it is
+    # left as it is rather than overwritten.
+    attribution.pairs()[['Trader', 'Symbol', 'Counterparty', 'PnL']].to_csv('pnl_output_pairs.csv', index=False)
 
-    print_pnl_table(all_pnl, tk.Tk())
+    table = attribution.table()
+    print(table)
+    print_pnl_table(table, tk.Tk())
 
     tk.mainloop()
 
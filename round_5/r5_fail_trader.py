@@ -2,6 +2,7 @@ from datamodel import OrderDepth, UserId, TradingState, Order
 from typing import List
 import numpy as np
 import math
+import json
 
 AMETHYST = "AMETHYSTS"
 STARFRUIT = "STARFRUIT"
@@ -109,8 +110,8 @@ class Trader:
 
         roses_order_depth: OrderDepth = state.order_depths[ROSES]
 
-        roses_bid, roses_bid_vol = list(roses_order_depth.buy_orders.items())[0]
-        roses_ask, roses_ask_vol = list(roses_order_depth.sell_orders.items())[0]
+        roses_bid, roses_bid_vol = max(roses_order_depth.buy_orders.items())
+        roses_ask, roses_ask_vol = min(roses_order_depth.sell_orders.items())
 
         roses_mid = (roses_ask + roses_bid) / 2
 
@@ -173,8 +174,8 @@ class Trader:
 
         coconut_order_depth: OrderDepth = state.order_depths[COCONUT]
 
-        coconut_bid, coconut_bid_vol = list(coconut_order_depth.buy_orders.items())[0]
-        coconut_ask, coconut_ask_vol = list(coconut_order_depth.sell_orders.items())[0]
+        coconut_bid, coconut_bid_vol = max(coconut_order_depth.buy_orders.items())
+        coconut_ask, coconut_ask_vol = min(coconut_order_depth.sell_orders.items())
 
         coconut_mid = (coconut_bid + coconut_ask) / 2
 
@@ -198,8 +199,8 @@ class Trader:
 
         straw_orders: OrderDepth = state.order_depths[STRAWBERRIES]
 
-        straw_bids, straw_bids_vol = list(straw_orders.buy_orders.items())[0]
-        straw_asks, straw_asks_vol = list(straw_orders.sell_orders.items())[0]
+        straw_bids, straw_bids_vol = max(straw_orders.buy_orders.items())
+        straw_asks, straw_asks_vol = min(straw_orders.sell_orders.items())
 
         if STRAWBERRIES in state.market_trades.keys():
             straw_trades = state.market_trades[STRAWBERRIES]
@@ -218,11 +219,14 @@ class Trader:
     def run(self, state: TradingState):
         result = {}
         conversions = 0
-        trader_data = ""
+        # The counterparty positions are tracked from trades, so they are kept in traderData to survive re-instantiation
+        if state.traderData:
+            self.vinnie_pos, self.valentina_pos = json.loads(state.traderData)
 
         straw_orders = self.roses_trades(state)
         result[ROSES] = straw_orders
 
         print(state.position)
 
+        trader_data = json.dumps([self.vinnie_pos, self.valentina_pos])
         return result, conversions, trader_data
\ No newline at end of file
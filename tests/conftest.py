@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The modules under test live at the repo root, which the scripts also put on sys.path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
@@ -0,0 +1,58 @@
+import json
+import os
+import pickle
+import pytest
+import datamodel
+from datamodel import Observation, TradingState
+from backtester import PriceReplay, trading_states
+from backtester import compact
+
+SAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks', 'samples')
+
+
+def plain(value):
+    """Rebuild compact objects, also inside dicts and lists, as the datamodel classes they replace."""
+    if isinstance(value, compact.Slotted):
+        return getattr(datamodel, type(value).__name__)(*(plain(getattr(value, name)) for name in type(value).__slots__))
+    if isinstance(value, dict):
+        return {key: plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [plain(item) for item in value]
+    return value
+
+
+def plain_state(state: TradingState) -> TradingState:
+    return TradingState(state.traderData, state.timestamp, plain(state.listings), plain(state.order_depths), plain(state.own_trades),
+                        plain(state.market_trades), state.position,
+                        Observation(state.observations.plainValueObservations, plain(state.observations.conversionObservations)))
+
+
+def test_replayed_state_to_json():
+    for tick, state in enumerate(PriceReplay(os.path.join(SAMPLES, 'round1_prices.csv')).states()):
+        assert json.loads(state.toJSON()) == json.loads(plain_state(state).toJSON())
+        if tick == 50:
+            break
+
+
+def test_streamed_state_to_json(tmp_path):
+    trades = tmp_path / 'trades.csv'
+    trades.write_text("timestamp,buyer,seller,symbol,currency,price,quantity\n"
+                      "0,Remy,Vinnie,ORCHIDS,SEASHELLS,1098.0,4\n"
+                      "0,SUBMISSION,Vinnie,AMETHYSTS,SEASHELLS,10002.0,2\n")
+    states = trading_states([os.path.join(SAMPLES, 'round2_prices.csv')], [(str(trades), 1)], [os.path.join(SAMPLES, 'round2_observations.csv')])
+    next(states)
+    state = next(states)
+
+    # The trades and conversion observations are all compact objects
+    assert state.market_trades['ORCHIDS'] and state.own_trades['AMETHYSTS'] and state.observations.conversionObservations
+    assert json.loads(state.toJSON()) == json.loads(plain_state(state).toJSON())
+
+
+def test_compact_objects_stay_slotted():
+    trade = compact.Trade("STARFRUIT", 5040.0, 3, "Remy", "Vinnie", 100)
+    assert vars(trade) == vars(datamodel.Trade("STARFRUIT", 5040.0, 3, "Remy", "Vinnie", 100))
+    assert vars(pickle.loads(pickle.dumps(trade))) == vars(trade)
+
+    # The __dict__ is built on demand, so the instance still takes no new attributes
+    with pytest.raises(AttributeError):
+        trade.note = "late"
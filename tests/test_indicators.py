@@ -0,0 +1,12 @@
+import numpy as np
+import pytest
+from indicators import EMA, ema
+
+
+@pytest.mark.parametrize('length', [0, 1, 2, 64, 65, 129, 5000])
+@pytest.mark.parametrize('alpha', [0.002, 0.33, 1.0])
+def test_ema_matches_streaming(length, alpha):
+    values = 5000 + np.cumsum(np.random.default_rng(length).normal(0, 1.5, length))
+    average = EMA(alpha)
+    streamed = np.array([average.update(value) for value in values])
+    assert np.allclose(ema(values, alpha), streamed, rtol=1e-13, atol=0)
@@ -0,0 +1,50 @@
+import math
+import numpy as np
+import pytest
+import pricing
+from pricing import BlackScholes, call_price, put_price, call_delta, put_delta, gamma, vega, call_theta, put_theta, implied_vol
+
+SPOTS = np.linspace(8000, 12000, 101)
+GREEKS = [('call', call_price), ('put', put_price), ('call_delta', call_delta), ('put_delta', put_delta),
+          ('gamma', gamma), ('vega', vega), ('call_theta', call_theta), ('put_theta', put_theta)]
+OPTIONS = [(strike, rate, vol, expiry) for strike in (9000, 10000, 11000) for vol in (0.05, 0.24086532541788852, 0.8)
+           for rate, expiry in ((-0.052855941708912724, 250 / 365), (0.05, 0.01), (0.0, 2.0))]
+
+
+def test_rational_ndtr_matches_erf():
+    x = np.linspace(-40, 40, 200_001)
+    expected = np.array([0.5 * math.erfc(-value / math.sqrt(2)) for value in x])
+    assert np.max(np.abs(pricing._rational_ndtr(x) - expected)) < 1e-15
+
+
+@pytest.mark.parametrize('strike, rate, vol, expiry', OPTIONS)
+def test_scalar_and_vectorized_agree(strike, rate, vol, expiry):
+    option = BlackScholes(strike, rate, vol, expiry)
+    for name, vectorized in GREEKS:
+        scalar = np.array([getattr(option, name)(spot) for spot in SPOTS])
+        error = np.max(np.abs(scalar - vectorized(SPOTS, strike, expiry, rate, vol)) / np.maximum(1, np.abs(scalar)))
+        assert error < 1e-9, f"{name} differs by {error}"
+
+
+@pytest.mark.parametrize('strike, rate, vol, expiry', OPTIONS)
+def test_put_call_parity(strike, rate, vol, expiry):
+    parity = call_price(SPOTS, strike, expiry, rate, vol) - put_price(SPOTS, strike, expiry, rate, vol)
+    assert np.allclose(parity, SPOTS - strike * math.exp(-rate * expiry), rtol=0, atol=1e-8)
+
+
+@pytest.mark.parametrize('strike, rate, vol, expiry', OPTIONS)
+def test_implied_vol_round_trip(strike, rate, vol, expiry):
+    prices = call_price(SPOTS, strike, expiry, rate, vol)
+    vols = implied_vol(prices, SPOTS, strike, expiry, rate)
+    solvable = ~np.isnan(vols)
+    assert solvable.any()
+    assert np.allclose(call_price(SPOTS[solvable], strike, expiry, rate, vols[solvable]), prices[solvable], rtol=0, atol=1e-7)
+
+    # Where the price still moves with volatility, the solver recovers it
+    sensitive = solvable & (vega(SPOTS, strike, expiry, rate, vol) > 1e-2)
+    assert np.allclose(vols[sensitive], vol, rtol=0, atol=1e-6)
+
+
+def test_implied_vol_rejects_prices_outside_the_bounds():
+    vols = implied_vol([0.0, 20000.0], 10000, 10000, 0.5, 0.0)
+    assert np.isnan(vols).all()
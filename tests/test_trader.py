@@ -0,0 +1,118 @@
+import ast
+import os
+import pytest
+import trader
+from datamodel import OrderDepth
+from trader import TICK, BasketSpread, BookMemo, ImpliedVolTracker, RollingHistory, Trader
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def test_trader_is_self_contained():
+    # The exchange runs trader.py on its own, with its datamodel, so it may not import the repo's modules
+    with open(os.path.join(ROOT, 'trader.py')) as file:
+        tree = ast.parse(file.read())
+    imported = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imported.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imported.add(node.module.split('.')[0])
+    assert imported <= {'datamodel', 'typing', 'numpy', 'math', 'json', 'jsonpickle'}
+
+
+def test_book_memo_is_per_depth_and_per_tick():
+    books = BookMemo()
+    books.start(0)
+    depth = OrderDepth({9998: 5, 10002: 3}, {10005: -4, 10004: -1})
+    assert books.levels(depth) == ([(10002, 3), (9998, 5)], [(10004, -1), (10005, -4)])
+    assert (books.best_bid(depth), books.best_ask(depth), books.mid_price(depth)) == (10002, 10004, 10003.0)
+
+    # Another book at the same timestamp is read afresh, however its id compares
+    empty = OrderDepth({10000: 1}, {})
+    assert books.best_bid(empty) == 10000 and books.best_ask(empty) is None and books.mid_price(empty) is None
+
+    # A new timestamp forgets the books of the last one, even if the exchange mutated them in place
+    depth.buy_orders[10003] = 2
+    books.start(TICK)
+    assert books.best_bid(depth) == 10003
+
+
+def test_rolling_history_lags():
+    history = RollingHistory(horizon=500)
+    for timestamp in range(0, 100_000, TICK):
+        history[timestamp] = timestamp / 2
+    assert history.lag(5) == 99_400 / 2 and len(history) == 6
+    assert history.items_since(99_700) == [(99_800, 49_900.0), (99_900, 49_950.0)]
+
+    # A missing tick is never answered with another tick's value
+    history[100_100] = 1.0
+    assert 100_000 not in history and history.lag(1) is None and history.lag(2) == 99_900 / 2
+
+
+def test_rolling_history_restarts_on_a_new_day():
+    history = RollingHistory(horizon=500)
+    for timestamp in range(0, 100_000, TICK):
+        history[timestamp] = timestamp / 2
+
+    # Timestamps restarting at a new day clear the previous day's values
+    history[0] = 7.0
+    history[100] = 8.0
+    assert history.latest == 100 and history.items() == [(0, 7.0), (100, 8.0)] and len(history) == 2
+    assert 99_900 not in history and history.lag(1) == 7.0
+    assert history.items_since(-1) == [(0, 7.0), (100, 8.0)]
+
+
+def test_implied_vol_tracker_reprices():
+    trader_ = Trader()
+    tracker = ImpliedVolTracker(trader.STRIKE, trader.RF, trader.EXPIRY, trader.VOL * 1.2, tolerance=1e-8, max_iterations=50)
+    for spot in range(9000, 11000, 25):
+        price = trader_.black_scholes_call(spot)
+        solved = tracker.update(price, spot)
+        assert solved == pytest.approx(trader.VOL, abs=1e-6)
+
+
+def test_basket_spread_matches_batch_statistics():
+    spread = BasketSpread()
+    spreads = []
+    for step in range(200):
+        for product, weight in spread.weights.items():
+            spread.update_component(product, 1000 + step % 7 * weight, 1002 + step % 7 * weight)
+        spread.update_basket(20000 + step % 11, 20002 + step % 11)
+        spreads.append(spread.observe())
+    mean = sum(spreads) / len(spreads)
+    assert spread.mean == pytest.approx(mean)
+    assert spread.variance() == pytest.approx(sum((value - mean) ** 2 for value in spreads) / len(spreads))
+
+
+def test_trader_data_round_trip():
+    source = Trader()
+    source.starfruit_ema = 5001.25
+    source.basket_spread.count, source.basket_spread.mean, source.basket_spread.m2 = 3, 1.5, 2.25
+    for timestamp in range(0, 10_000, TICK):
+        source.coupon_mid_prices[timestamp] = 600 + timestamp / 200
+        source.coconut_mid_prices[timestamp] = 10_000 - timestamp / 200
+    data = source.dump_trader_data()
+
+    restored = Trader()
+    restored.load_trader_data(data)
+    assert restored.starfruit_ema == 5001.25
+    assert (restored.basket_spread.count, restored.basket_spread.mean, restored.basket_spread.m2) == (3, 1.5, 2.25)
+    assert restored.coupon_mid_prices.items() == source.coupon_mid_prices.items()
+    assert restored.coconut_mid_prices.items() == source.coconut_mid_prices.items()
+    assert restored.dump_trader_data() == data
+
+
+def test_trader_data_stays_within_budget(monkeypatch):
+    source = Trader()
+    source.starfruit_ema = 5001.25
+    for timestamp in range(0, 10_000, TICK):
+        source.coupon_mid_prices[timestamp] = 600.5
+        source.coconut_mid_prices[timestamp] = 10_000.5
+
+    # Over the budget the mid histories go first, then everything
+    monkeypatch.setattr(trader, 'TRADER_DATA_BUDGET', 200)
+    data = source.dump_trader_data()
+    assert 0 < len(data) <= 200 and 'mid_prices' not in data
+    monkeypatch.setattr(trader, 'TRADER_DATA_BUDGET', 10)
+    assert source.dump_trader_data() == ""
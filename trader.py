@@ -1,7 +1,8 @@
 from datamodel import OrderDepth, UserId, TradingState, Order
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import numpy as np
 import math
+import json
 
 AMETHYST = "AMETHYSTS"
 STARFRUIT = "STARFRUIT"
@@ -16,6 +17,436 @@ STRIKE = 10000
 RF = -0.052855941708912724
 VOL = 0.24086532541788852
 EXPIRY = 250/365
+# The exchange truncates longer traderData
+TRADER_DATA_BUDGET = 10_000
+SQRT_2 = math.sqrt(2)
+INV_SQRT_2PI = 1 / math.sqrt(2 * math.pi)
+# The timestamp step between ticks
+TICK = 100
+# The units of each component in a gift basket, and the premium of the basket over them
+BASKET_WEIGHTS = {STRAWBERRIES: 6, CHOCOLATE: 4, ROSES: 1}
+BASKET_TRANSLATION = 355
+
+
+# The exchange runs this file on its own, so the helpers the Trader needs are kept here
+# rather than imported from the shared modules next to it.
+
+def norm_cdf(x: float) -> float:
+    """Calculate the cumulative distribution function (CDF) of the standard normal distribution."""
+    return 0.5 * (1 + math.erf(x / SQRT_2))
+
+
+def norm_pdf(x: float) -> float:
+    """Calculate the probability density function (PDF) of the standard normal distribution."""
+    return INV_SQRT_2PI * math.exp(-0.5 * x * x)
+
+
+def levels(order_depth: OrderDepth) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """Return the (price, volume) bid levels from the highest price and ask levels from the lowest."""
+    return sorted(order_depth.buy_orders.items(), reverse=True), sorted(order_depth.sell_orders.items())
+
+
+def best_bid(order_depth: OrderDepth) -> Optional[int]:
+    """Return the highest bid price, or None if there are no bids."""
+    buy_orders = order_depth.buy_orders
+    return max(buy_orders) if buy_orders else None
+
+
+def best_ask(order_depth: OrderDepth) -> Optional[int]:
+    """Return the lowest ask price, or None if there are no asks."""
+    sell_orders = order_depth.sell_orders
+    return min(sell_orders) if sell_orders else None
+
+
+def mid_price(order_depth: OrderDepth) -> Optional[float]:
+    """Return the average of the best bid and ask, or None if either side is empty."""
+    buy_orders, sell_orders = order_depth.buy_orders, order_depth.sell_orders
+    if not buy_orders or not sell_orders:
+        return None
+    return (max(buy_orders) + min(sell_orders)) / 2
+
+
+class BookMemo:
+    """
+    The top of book helpers above, memoized per OrderDepth for one timestamp.
+
+    Entries are keyed on the identity of the OrderDepth and keep a reference to it,
+    so an id reused by another object can never return its levels. Moving to a new
+    timestamp clears every entry, so the plain dict books the exchange sends are
+    memoized too. The books must not be mutated within a tick.
+    """
+
+    def __init__(self):
+        self.timestamp: Optional[int] = None
+        self.entries: Dict[int, list] = {}
+
+    def start(self, timestamp: int) -> None:
+        """Forget the books of the previous tick if the timestamp has changed."""
+        if timestamp != self.timestamp:
+            self.timestamp = timestamp
+            self.entries.clear()
+
+    def entry(self, order_depth: OrderDepth) -> list:
+        """Return the [order_depth, best_bid, best_ask, levels] entry of an OrderDepth, creating it on first use.
+
+        The levels are only sorted once a strategy asks for them, so a book read
+        only at the top costs a max and a min.
+        """
+        entry = self.entries.get(id(order_depth))
+        if entry is None or entry[0] is not order_depth:
+            entry = [order_depth, best_bid(order_depth), best_ask(order_depth), None]
+            self.entries[id(order_depth)] = entry
+        return entry
+
+    def levels(self, order_depth: OrderDepth) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """Return the (price, volume) bid levels from the highest price and ask levels from the lowest."""
+        entry = self.entry(order_depth)
+        if entry[3] is None:
+            entry[3] = levels(order_depth)
+        return entry[3]
+
+    def best_bid(self, order_depth: OrderDepth) -> Optional[int]:
+        """Return the highest bid price, or None if there are no bids."""
+        return self.entry(order_depth)[1]
+
+    def best_ask(self, order_depth: OrderDepth) -> Optional[int]:
+        """Return the lowest ask price, or None if there are no asks."""
+        return self.entry(order_depth)[2]
+
+    def mid_price(self, order_depth: OrderDepth) -> Optional[float]:
+        """Return the average of the best bid and ask, or None if either side is empty."""
+        entry = self.entry(order_depth)
+        if entry[1] is None or entry[2] is None:
+            return None
+        return (entry[1] + entry[2]) / 2
+
+
+class RollingHistory:
+    """
+    A fixed-size ring buffer of values keyed by timestamp.
+
+    Each timestamp owns the slot (timestamp // step) % size, and the slot keeps
+    the timestamp it was written for. A lookup only succeeds if the slot still
+    holds that exact timestamp, so values of missing ticks, of ticks older than
+    the horizon and of previous days are never returned in their place. A timestamp
+    lower than the latest one starts a new day and clears the buffer first. Appends
+    and lookups are O(1) and memory stays fixed however long the trader runs.
+
+    It reads and writes like the dict it replaces, history[timestamp] = value,
+    timestamp in history and history[timestamp], without the unbounded growth.
+    """
+
+    def __init__(self, horizon: int, step: int = TICK):
+        """Initialize an empty history.
+
+        Args:
+            horizon (int): The furthest lag, in timestamp units, that must stay available.
+            step (int): The timestamp step between ticks.
+        """
+        self.horizon = horizon
+        self.step = step
+        self.size = horizon // step + 1
+        self.timestamps: List[Optional[int]] = [None] * self.size
+        self.values: List[float] = [0.0] * self.size
+        self.latest: Optional[int] = None
+
+    def append(self, timestamp: int, value: float) -> None:
+        """Record the value of a timestamp, overwriting the oldest slot, or start over if timestamps restarted."""
+        latest = self.latest
+        if latest is not None and timestamp < latest:
+            self.clear()
+            latest = None
+        slot = (timestamp // self.step) % self.size
+        self.timestamps[slot] = timestamp
+        self.values[slot] = value
+        if latest is None or timestamp > latest:
+            self.latest = timestamp
+
+    def get(self, timestamp: int, default: float = None) -> Optional[float]:
+        """Return the value of a timestamp, or the default if it was never recorded or has been overwritten."""
+        slot = (timestamp // self.step) % self.size
+        if self.timestamps[slot] == timestamp:
+            return self.values[slot]
+        return default
+
+    def lag(self, ticks: int, default: float = None) -> Optional[float]:
+        """Return the value recorded the given number of ticks before the latest one."""
+        if self.latest is None:
+            return default
+        return self.get(self.latest - ticks * self.step, default)
+
+    def items(self) -> List[Tuple[int, float]]:
+        """Return the (timestamp, value) pairs within the horizon of the latest timestamp, oldest first."""
+        if self.latest is None:
+            return []
+        # The slot after the latest one holds the oldest value, so reading the ring from there is in timestamp order
+        start = (self.latest // self.step + 1) % self.size
+        oldest = self.latest - self.horizon
+        timestamps = self.timestamps[start:] + self.timestamps[:start]
+        values = self.values[start:] + self.values[:start]
+        return [(timestamp, value) for timestamp, value in zip(timestamps, values) if timestamp is not None and timestamp >= oldest]
+
+    def items_since(self, timestamp: int) -> List[Tuple[int, float]]:
+        """Return the (timestamp, value) pairs after a timestamp and within the horizon, oldest first, in O(new entries)."""
+        if self.latest is None:
+            return []
+        latest_slot = self.latest // self.step
+        oldest = max(timestamp + 1, self.latest - self.horizon)
+        items = []
+        # Walk back from the latest slot, one tick per slot, until the timestamp is reached
+        for ticks in range(min((self.latest - oldest) // self.step + 1, self.size)):
+            slot = (latest_slot - ticks) % self.size
+            slot_timestamp = self.timestamps[slot]
+            if slot_timestamp is not None and oldest <= slot_timestamp <= self.latest:
+                items.append((slot_timestamp, self.values[slot]))
+        items.reverse()
+        return items
+
+    def extend(self, items: Iterable[Tuple[int, float]]) -> None:
+        """Append (timestamp, value) pairs in order."""
+        for timestamp, value in items:
+            self.append(timestamp, value)
+
+    def clear(self) -> None:
+        """Forget every recorded value."""
+        self.timestamps = [None] * self.size
+        self.latest = None
+
+    def __setitem__(self, timestamp: int, value: float) -> None:
+        self.append(timestamp, value)
+
+    def __getitem__(self, timestamp: int) -> float:
+        slot = (timestamp // self.step) % self.size
+        if self.timestamps[slot] != timestamp:
+            raise KeyError(timestamp)
+        return self.values[slot]
+
+    def __contains__(self, timestamp: int) -> bool:
+        return self.timestamps[(timestamp // self.step) % self.size] == timestamp
+
+    def __len__(self) -> int:
+        return len(self.items())
+
+
+class ImpliedVolTracker:
+    """
+    Tracks the implied volatility of a call option tick by tick.
+
+    Each update starts Newton's method from the previous tick's solution, which is
+    usually within a tick's price move of the new one, so it converges in one or
+    two iterations. An exponential moving average of the solutions gives a
+    volatility to price against that is not just the current tick's price.
+    """
+
+    def __init__(self, strike: float, rate: float, expiry: float, initial_vol: float, alpha: float = 0.01,
+                 tolerance: float = 1e-4, max_iterations: int = 5):
+        """Initialize the tracker.
+
+        Args:
+            strike (float): The strike price.
+            rate (float): The annual risk-free rate.
+            expiry (float): The time to expiry in years.
+            initial_vol (float): The volatility to start from.
+            alpha (float): The weight of each new solution in the moving average.
+            tolerance (float): The largest acceptable pricing error, far below a price tick.
+            max_iterations (int): The cap on Newton steps per tick.
+        """
+        self.strike = strike
+        self.rate = rate
+        self.expiry = expiry
+        self.alpha = alpha
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+        self.sqrt_t = math.sqrt(expiry)
+        self.discounted_strike = strike * math.exp(-rate * expiry)
+        self.vol = initial_vol
+        self.smoothed_vol = initial_vol
+        # The Newton steps the last solve took
+        self.iterations = 0
+
+    def solve(self, price: float, spot: float) -> float:
+        """Return the implied volatility of a call price, starting from the last solution, or None if there is none."""
+        if not max(spot - self.discounted_strike, 0) < price < spot:
+            return None
+
+        log_moneyness = math.log(spot / self.strike)
+        vol = self.vol
+        for iteration in range(self.max_iterations + 1):
+            vol_sqrt_t = vol * self.sqrt_t
+            d1 = (log_moneyness + (self.rate + 0.5 * vol * vol) * self.expiry) / vol_sqrt_t
+            error = spot * norm_cdf(d1) - self.discounted_strike * norm_cdf(d1 - vol_sqrt_t) - price
+            if abs(error) < self.tolerance:
+                self.iterations = iteration
+                return vol
+            if iteration == self.max_iterations:
+                break
+            option_vega = spot * norm_pdf(d1) * self.sqrt_t
+            if option_vega < 1e-12:
+                break
+            vol = max(vol - error / option_vega, 1e-6)
+
+        self.iterations = self.max_iterations
+        return None
+
+    def update(self, price: float, spot: float) -> float:
+        """Solve for the tick's implied volatility and fold it into the moving average.
+
+        Args:
+            price (float): The call's mid price.
+            spot (float): The underlying's mid price.
+
+        Returns:
+            float: The tick's implied volatility, or None if it did not converge, in which case nothing changes.
+        """
+        vol = self.solve(price, spot)
+        if vol is not None:
+            self.vol = vol
+            self.smoothed_vol = self.alpha * vol + (1 - self.alpha) * self.smoothed_vol
+        return vol
+
+
+class BasketSpread:
+    """
+    Keeps the synthetic basket price and the statistics of the basket's spread over it in O(1) per update.
+
+    The synthetic bid and ask are the weighted sums of the component bids and asks plus
+    the translation. A component quote update shifts them by the weighted change of that
+    quote instead of re-summing every component. Each observe() call feeds the spread of the
+    basket mid over the synthetic mid into a running mean and variance: Welford's algorithm
+    over every observation when alpha is None, or an exponentially weighted mean and
+    variance with that smoothing factor otherwise, so the statistics can follow a drifting
+    spread without a window of past values.
+    """
+
+    def __init__(self, weights: Dict[str, int] = BASKET_WEIGHTS, translation: float = BASKET_TRANSLATION, alpha: Optional[float] = None):
+        """Initialize the engine with no quotes.
+
+        Args:
+            weights (Dict[str, int]): The number of units of each component in a basket.
+            translation (float): The premium of the basket over its components.
+            alpha (Optional[float]): The EMA smoothing factor, or None for the mean and variance of all observations.
+        """
+        self.weights = dict(weights)
+        self.translation = translation
+        self.alpha = alpha
+        self.bids: Dict[str, float] = {}
+        self.asks: Dict[str, float] = {}
+        self.synthetic_bid = translation
+        self.synthetic_ask = translation
+        self.basket_bid = None
+        self.basket_ask = None
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update_component(self, product: str, bid: float, ask: float) -> None:
+        """Update the quote of a component and shift the synthetic prices by its change."""
+        weight = self.weights[product]
+        self.synthetic_bid += weight * (bid - self.bids.get(product, 0))
+        self.synthetic_ask += weight * (ask - self.asks.get(product, 0))
+        self.bids[product] = bid
+        self.asks[product] = ask
+
+    def update_basket(self, bid: float, ask: float) -> None:
+        """Update the quote of the basket itself."""
+        self.basket_bid = bid
+        self.basket_ask = ask
+
+    def update(self, state: TradingState, books: Optional[BookMemo] = None) -> Optional[float]:
+        """Update every quote from the best bids and asks of a tick and observe the spread.
+
+        Products with an empty side keep their previous quote.
+
+        Args:
+            state (TradingState): The tick to read the books of.
+            books (BookMemo): The memo to read the best prices through, shared with the caller's strategies.
+
+        Returns:
+            Optional[float]: The observed spread, or None until every product has been quoted.
+        """
+        if books is None:
+            books = BookMemo()
+        for product in self.weights:
+            depth = state.order_depths.get(product)
+            if depth is not None:
+                bid, ask = books.best_bid(depth), books.best_ask(depth)
+                if bid is not None and ask is not None:
+                    self.update_component(product, bid, ask)
+
+        depth = state.order_depths.get(GIFT_BASKET)
+        if depth is not None:
+            bid, ask = books.best_bid(depth), books.best_ask(depth)
+            if bid is not None and ask is not None:
+                self.update_basket(bid, ask)
+        return self.observe()
+
+    def ready(self) -> bool:
+        """Return whether the basket and every component have been quoted."""
+        return self.basket_bid is not None and len(self.bids) == len(self.weights)
+
+    def synthetic_mid(self) -> float:
+        """Return the mid of the synthetic bid and ask."""
+        return (self.synthetic_bid + self.synthetic_ask) / 2
+
+    def spread(self) -> Optional[float]:
+        """Return the basket mid minus the synthetic mid, or None until every product has been quoted."""
+        if not self.ready():
+            return None
+        return (self.basket_bid + self.basket_ask) / 2 - self.synthetic_mid()
+
+    def observe(self) -> Optional[float]:
+        """Feed the current spread into the running mean and variance.
+
+        Returns:
+            Optional[float]: The observed spread, or None until every product has been quoted.
+        """
+        spread = self.spread()
+        if spread is None:
+            return None
+
+        self.count += 1
+        difference = spread - self.mean
+        if self.alpha is None or self.count == 1:
+            self.mean += difference / self.count
+            self.m2 += difference * (spread - self.mean)
+        else:
+            increment = self.alpha * difference
+            self.mean += increment
+            self.m2 = (1 - self.alpha) * (self.m2 + difference * increment)
+        return spread
+
+    def variance(self) -> float:
+        """Return the variance of the observed spreads."""
+        if self.alpha is None:
+            return self.m2 / self.count if self.count else 0.0
+        return self.m2
+
+    def std(self) -> float:
+        """Return the standard deviation of the observed spreads."""
+        return math.sqrt(self.variance())
+
+    def zscore(self) -> Optional[float]:
+        """Return how many standard deviations the current spread is from its mean, or None without a spread or variance."""
+        spread = self.spread()
+        std = self.std()
+        if spread is None or std == 0:
+            return None
+        return (spread - self.mean) / std
+
+    def edges(self, z: float) -> Optional[tuple]:
+        """Return the (sell, buy) edges of the basket over the synthetic price at a z-score.
+
+        The basket is rich when its bid exceeds the synthetic ask by more than the sell edge,
+        and cheap when the synthetic bid exceeds its ask by more than the buy edge.
+
+        Returns:
+            Optional[tuple]: The sell and buy edges rounded to whole prices, or None before any observation.
+        """
+        if not self.count:
+            return None
+        band = z * self.std()
+        return round(self.mean + band), round(band - self.mean)
 
 
 class Trader:
@@ -27,9 +458,6 @@ class Trader:
         __init__():
             Initializes a Trader object with default parameter values.
 
-        norm_cdf(x: float) -> float:
-            Computes the cumulative distribution function (CDF) of the standard normal distribution.
-
         black_scholes_call(spot_price: float) -> float:
             Calculates the Black-Scholes call option price for a given spot price.
 
@@ -51,6 +479,15 @@ class Trader:
         round_3_trades(state: TradingState) -> Tuple[List[Order], List[Order]]:
             Generates trading orders for STRAWBERRIES and GIFT_BASKET symbols.
 
+        basket_edges() -> Tuple[float, float]:
+            Returns the fixed or z-score edges of the gift basket over its synthetic price.
+
+        load_trader_data(trader_data: str):
+            Restores the persisted state from the traderData of the previous tick.
+
+        dump_trader_data() -> str:
+            Encodes the persisted state as traderData.
+
         run(state: TradingState) -> Tuple[Dict[str, List[Order]], int, str]:
             Executes the complete trading strategy for all symbols and returns trading orders, conversions, and trader data.
     """
@@ -73,39 +510,47 @@ class Trader:
         self.r3_ratio_matrix = np.array([[6 + 4 * 1.9656933442176188 + 3.6026796488094828],
                                 [6 * 0.5088062931960909 + 4 + 1.8328332608080198],
                                 [6 * 0.277611864773156 + 4 * 0.5456307844901649 + 1]])
-        self.translation = 355
+        self.translation = BASKET_TRANSLATION
+        self.straw_edge = 20
+        self.basket_sell_edge = 25
+        self.basket_buy_edge = 55
+        # The spread of the basket over its components, with a z-score band that replaces the fixed edges when set
+        self.basket_spread = BasketSpread(translation=self.translation, alpha=0.002)
+        self.basket_z_edge = None
 
         self.coconut_position_limit = 300
         self.coupon_position_limit = 600
-        self.coupon_mid_prices = {}
-        self.coconut_mid_prices = {}
+        self.coupon_iv = ImpliedVolTracker(STRIKE, RF, EXPIRY, VOL)
+        self.price_with_implied_vol = False
+        # The coupon strategy compares mids with those 5000 timestamps earlier
+        self.delta_lookback = 5000
+        self.coupon_mid_prices = RollingHistory(self.delta_lookback)
+        self.coconut_mid_prices = RollingHistory(self.delta_lookback)
+        self.scholes_take_edge = 6
+        self.scholes_make_edge = 10
+
+        # The traderData this instance returned last, which load_trader_data need not decode
+        self.trader_data = None
+        # The sorted levels and best prices of this tick's books, computed once per book
+        self.books = BookMemo()
 
     
-    def norm_cdf(self, x: float) -> float:
-        """Calculate the cumulative distribution function (CDF) of the standard normal distribution.
-
-        Args:
-            x (float): The value for which the CDF is calculated.
-
-        Returns:
-            float: The CDF value for the standard normal distribution at x.
-        """
-        return 0.5 * (1 + math.erf(x / math.sqrt(2)))
-
-
     def black_scholes_call(self, spot_price: float) -> float:
         """Calculate the Black-Scholes price for a call option.
 
+        The volatility is the fitted VOL, or the moving average of the coupon's
+        implied volatility if price_with_implied_vol is set.
+
         Args:
             spot_price (float): The current price of the underlying asset.
 
         Returns:
             float: The Black-Scholes call option price.
         """
-        d1 = (np.log(spot_price / STRIKE) + (RF + 0.5 * VOL**2) * EXPIRY) / (VOL * np.sqrt(EXPIRY))
-        d2 = d1 - VOL * np.sqrt(EXPIRY)
-        call_price = spot_price * self.norm_cdf(d1) - STRIKE * np.exp(-RF * EXPIRY) * self.norm_cdf(d2)
-        return call_price
+        vol = self.coupon_iv.smoothed_vol if self.price_with_implied_vol else VOL
+        vol_sqrt_t = vol * math.sqrt(EXPIRY)
+        d1 = (math.log(spot_price / STRIKE) + (RF + 0.5 * vol ** 2) * EXPIRY) / vol_sqrt_t
+        return spot_price * norm_cdf(d1) - STRIKE * math.exp(-RF * EXPIRY) * norm_cdf(d1 - vol_sqrt_t)
 
 
     def calculate_starfruit_ema(self, mid_price: float) -> None:
@@ -150,15 +595,13 @@ class Trader:
         # Retrieve the order depth for STARFRUIT
         starfruit_order_depth: OrderDepth = state.order_depths[STARFRUIT]
 
-        # Get the best bid and ask prices
-        best_bid_price, _ = list(starfruit_order_depth.buy_orders.items())[0]
-        best_ask_price, _ = list(starfruit_order_depth.sell_orders.items())[0]
-
         # Calculate the mid-price as a simple average of the best bid and ask prices
-        mid_price = (best_ask_price + best_bid_price) / 2
+        starfruit_mid_price = self.books.mid_price(starfruit_order_depth)
+        if starfruit_mid_price is None:
+            return orders
 
         # Update the EMA with the latest mid-price
-        self.calculate_starfruit_ema(mid_price)
+        self.calculate_starfruit_ema(starfruit_mid_price)
 
         # Create bid and ask orders around the EMA
         profitable_bid_price = math.floor(self.starfruit_ema - 1)
@@ -209,6 +652,8 @@ class Trader:
                         negative_tally -= max_volume
 
         for price, volume in amethyst_order_depth.sell_orders.items():
+            # Sell order volumes are negative, so the volume on offer is -volume
+            volume = -volume
             if price < self.amethyst_fair_price:
                 if current_position + volume <= self.star_and_am_position_limit:
                     orders.append(Order(AMETHYST, price, volume))
@@ -303,14 +748,23 @@ class Trader:
         roses_order_depth: OrderDepth = state.order_depths[ROSES]
         gift_order_depth: OrderDepth = state.order_depths[GIFT_BASKET]
 
-        straw_bid = list(strawberry_order_depth.buy_orders.items())[0][0]
-        straw_ask = list(strawberry_order_depth.sell_orders.items())[0][0]
-        choc_bid = list(chocolate_order_depth.buy_orders.items())[0][0]
-        choc_ask = list(chocolate_order_depth.sell_orders.items())[0][0]
-        roses_bid = list(roses_order_depth.buy_orders.items())[0][0]
-        roses_ask = list(roses_order_depth.sell_orders.items())[0][0]
-        gift_bid = list(gift_order_depth.buy_orders.items())[0][0]
-        gift_ask = list(gift_order_depth.sell_orders.items())[0][0]
+        sell_edge, buy_edge = self.basket_edges()
+        # The synthetic prices kept by the engine, moved to the current translation should it have been changed
+        offset = self.translation - self.basket_spread.translation
+        synthetic_bid = self.basket_spread.synthetic_bid + offset
+        synthetic_ask = self.basket_spread.synthetic_ask + offset
+
+        straw_bid = self.books.best_bid(strawberry_order_depth)
+        straw_ask = self.books.best_ask(strawberry_order_depth)
+        choc_bid = self.books.best_bid(chocolate_order_depth)
+        choc_ask = self.books.best_ask(chocolate_order_depth)
+        roses_bid = self.books.best_bid(roses_order_depth)
+        roses_ask = self.books.best_ask(roses_order_depth)
+        gift_bid = self.books.best_bid(gift_order_depth)
+        gift_ask = self.books.best_ask(gift_order_depth)
+
+        if None in (straw_bid, straw_ask, choc_bid, choc_ask, roses_bid, roses_ask, gift_bid, gift_ask):
+            return strawberry_orders, gift_basket_orders
 
         temp_straw_pos = strawberry_position
         temp_gift_pos = gift_basket_position
@@ -321,20 +775,20 @@ class Trader:
         straw_buying_pos = 0
 
         # Determine a profitable strawberry ask value w.r.t the the components (market making)
-        profitable_straw_ask = math.ceil((gift_ask - self.translation) / self.r3_ratio_matrix[0][0]) + 20
+        profitable_straw_ask = math.ceil((gift_ask - self.translation) / self.r3_ratio_matrix[0][0]) + self.straw_edge
         straw_max_ask_vol = max((-self.strawberry_pos_limit - temp_straw_pos - straw_selling_pos), -self.strawberry_pos_limit)
         if straw_max_ask_vol != 0:
             strawberry_orders.append(Order(STRAWBERRIES, profitable_straw_ask, straw_max_ask_vol))
 
         # Determine a profitable strawberry bid value w.r.t the the components (market making)
-        profitable_straw_bid = math.floor((gift_bid - self.translation) / self.r3_ratio_matrix[0][0]) - 20
+        profitable_straw_bid = math.floor((gift_bid - self.translation) / self.r3_ratio_matrix[0][0]) - self.straw_edge
         straw_max_bid_vol = min((self.strawberry_pos_limit - temp_straw_pos - straw_buying_pos), self.strawberry_pos_limit)
         if straw_max_bid_vol != 0:
             strawberry_orders.append(Order(STRAWBERRIES, profitable_straw_bid, straw_max_bid_vol))
         
         # Find profitable gift basket ask value w.r.t the the components (market taking)
         for bid, vol in list(gift_order_depth.buy_orders.items()):
-            if bid - 25 > (6 * straw_ask + 4 * choc_ask + roses_ask + self.translation) and temp_gift_pos > -60:
+            if bid - sell_edge > synthetic_ask and temp_gift_pos > -60:
                 gift_max_ask_vol = abs(-self.gift_basket_pos_limit - temp_gift_pos)
                 min_gift_pos = min(abs(vol), gift_max_ask_vol)
                 if min_gift_pos != 0:
@@ -344,7 +798,7 @@ class Trader:
 
         # Find profitable gift basket bid value w.r.t the the components (market taking)
         for ask, vol in list(gift_order_depth.sell_orders.items()):
-            if ask + 55 < 6 * straw_bid + 4 * choc_bid + roses_bid + self.translation and temp_gift_pos < 58:
+            if ask + buy_edge < synthetic_bid and temp_gift_pos < 58:
                 gift_max_bid_vol = abs(self.gift_basket_pos_limit - temp_gift_pos)
                 min_gift_pos = min(abs(vol), gift_max_bid_vol)
                 if min_gift_pos != 0:
@@ -355,6 +809,21 @@ class Trader:
         return strawberry_orders, gift_basket_orders
 
 
+    def basket_edges(self) -> Tuple[float, float]:
+        """Return the edges the gift basket must clear over its synthetic price to be sold or bought.
+
+        These are the fixed basket_sell_edge and basket_buy_edge unless basket_z_edge is set, in
+        which case they are the band of that many standard deviations around the mean spread.
+
+        Returns:
+            Tuple[float, float]: The sell and buy edges.
+        """
+        if self.basket_z_edge is None:
+            return self.basket_sell_edge, self.basket_buy_edge
+        edges = self.basket_spread.edges(self.basket_z_edge)
+        return edges if edges is not None else (self.basket_sell_edge, self.basket_buy_edge)
+
+
     def generate_coconut_coupon_orders(self, state: TradingState) -> List[Order]:
         """
         Generate trading orders for the COCONUT and COCONUT_COUPON symbols.
@@ -380,11 +849,9 @@ class Trader:
         coconut_order_depth: OrderDepth = state.order_depths[COCONUT]
         coupon_order_depth: OrderDepth = state.order_depths[COCONUT_COUPON]
 
-        # Get buy and sell orders
-        coconut_asks = list(coconut_order_depth.sell_orders.items())
-        coconut_bids = list(coconut_order_depth.buy_orders.items())
-        coupon_asks = list(coupon_order_depth.sell_orders.items())
-        coupon_bids = list(coupon_order_depth.buy_orders.items())
+        # Get buy and sell orders, best price first
+        coconut_bids, coconut_asks = self.books.levels(coconut_order_depth)
+        coupon_bids, coupon_asks = self.books.levels(coupon_order_depth)
 
         if coupon_asks and coupon_bids and coconut_asks and coconut_bids:
             best_coconut_ask = coconut_asks[0][0]
@@ -400,30 +867,33 @@ class Trader:
                 self.coconut_mid_prices[state.timestamp] = coconut_mid
                 black_scholes_est = self.black_scholes_call(coconut_mid)
 
+                # Track the implied volatility after pricing, so the estimate never prices at this tick's own mid
+                self.coupon_iv.update(coupon_mid, coconut_mid)
+
                 sell_limit = -self.coupon_position_limit - coupon_position
                 buy_limit = self.coupon_position_limit - coupon_position
 
                 # Generate Black-Scholes based orders
                 for bid_price, bid_volume in coupon_bids:
-                    if black_scholes_est + 6 < bid_price:
+                    if black_scholes_est + self.scholes_take_edge < bid_price:
                         max_sell_volume = max(sell_limit, -bid_volume)
                         coupon_scholes_orders.append(Order(COCONUT_COUPON, bid_price, max_sell_volume))
                         sell_limit -= max_sell_volume
                                 
                 for ask_price, ask_volume in coupon_asks:
-                    if black_scholes_est - 6 > ask_price:
+                    if black_scholes_est - self.scholes_take_edge > ask_price:
                         max_buy_volume = min(buy_limit, -ask_volume)
                         coupon_scholes_orders.append(Order(COCONUT_COUPON, ask_price, max_buy_volume))
                         buy_limit -= max_buy_volume
                 
-                profitable_ask_price = math.ceil(black_scholes_est + 10)
+                profitable_ask_price = math.ceil(black_scholes_est + self.scholes_make_edge)
                 coupon_scholes_orders.append(Order(COCONUT_COUPON, profitable_ask_price, sell_limit))
                 
-                profitable_bid_price = math.floor(black_scholes_est - 10)
+                profitable_bid_price = math.floor(black_scholes_est - self.scholes_make_edge)
                 coupon_scholes_orders.append(Order(COCONUT_COUPON, profitable_bid_price, buy_limit))
 
             # Generated instantaneous delta-based orders
-            previous_timestamp = state.timestamp - 5000
+            previous_timestamp = state.timestamp - self.delta_lookback
             if previous_timestamp in self.coupon_mid_prices:
 
                 previous_coupon_mid_price = self.coupon_mid_prices[previous_timestamp]
@@ -488,6 +958,63 @@ class Trader:
             return coupon_delta_orders
         
 
+    def load_trader_data(self, trader_data: str) -> None:
+        """Restore the persisted state from traderData.
+
+        The state is only decoded after the platform re-instantiates the trader. Otherwise
+        traderData is what this instance returned last tick and its attributes are current.
+
+        Args:
+            trader_data (str): The traderData of the current state.
+        """
+        if not trader_data or trader_data == self.trader_data:
+            return
+
+        data = json.loads(trader_data)
+        self.starfruit_ema = data.get('starfruit_ema')
+        if 'basket_spread' in data:
+            self.basket_spread.count, self.basket_spread.mean, self.basket_spread.m2 = data['basket_spread']
+        if 'coupon_iv' in data:
+            self.coupon_iv.vol, self.coupon_iv.smoothed_vol = data['coupon_iv']
+        if 'mid_prices' in data:
+            self.coupon_mid_prices.clear()
+            self.coconut_mid_prices.clear()
+            for timestamp, coupon_mid, coconut_mid in zip(*data['mid_prices']):
+                self.coupon_mid_prices[timestamp] = coupon_mid / 2
+                self.coconut_mid_prices[timestamp] = coconut_mid / 2
+        self.trader_data = trader_data
+
+    def dump_trader_data(self) -> str:
+        """Encode the persisted state as traderData, within TRADER_DATA_BUDGET.
+
+        The basket and coupon state is only included once their products have traded. If
+        the state is over the budget, the mid price histories are dropped, as they refill
+        within delta_lookback, and if it is still over, nothing is persisted.
+
+        Returns:
+            str: The traderData for the next tick.
+        """
+        data = {'starfruit_ema': self.starfruit_ema}
+        if self.basket_spread.count:
+            data['basket_spread'] = [self.basket_spread.count, self.basket_spread.mean, self.basket_spread.m2]
+        if self.coupon_mid_prices.latest is not None:
+            data['coupon_iv'] = [self.coupon_iv.vol, self.coupon_iv.smoothed_vol]
+            # Both histories are written on the same ticks, and mids are on half ticks, so they are stored
+            # as the shared timestamps and twice each mid, as integers encode much faster than floats
+            timestamps, coupon_mids = zip(*self.coupon_mid_prices.items())
+            coconut_mids = [mid for _, mid in self.coconut_mid_prices.items()]
+            data['mid_prices'] = [timestamps, [int(2 * mid) for mid in coupon_mids], [int(2 * mid) for mid in coconut_mids]]
+
+        trader_data = json.dumps(data)
+        if len(trader_data) > TRADER_DATA_BUDGET:
+            data.pop('mid_prices', None)
+            trader_data = json.dumps(data)
+            if len(trader_data) > TRADER_DATA_BUDGET:
+                trader_data = ""
+
+        self.trader_data = trader_data
+        return trader_data
+
     def run(self, state: TradingState):
         """Execute the trading strategy for various symbols.
 
@@ -506,21 +1033,25 @@ class Trader:
         """
         results = {}
         conversions = 0
-        trader_data = ""
-
-        # Generate orders for each symbol
-        starfruit_orders = self.generate_starfruit_orders(state)
-        amethyst_orders = self.generate_amethyst_orders(state)
-        orchid_orders, conversions = self.generate_orchid_orders(state)
-        strawberry_orders, gift_basket_orders = self.round_3_trades(state)
-        coconut_coupon_orders = self.generate_coconut_and_coupon_orders(state)
-
-        # Store orders for each symbol in the result dictionary
-        results[STARFRUIT] = starfruit_orders
-        results[AMETHYST] = amethyst_orders
-        results[ORCHIDS] = orchid_orders
-        results[STRAWBERRIES] = strawberry_orders
-        results[GIFT_BASKET] = gift_basket_orders
-        results[COCONUT_COUPON] = coconut_coupon_orders
+        self.load_trader_data(state.traderData)
+        self.books.start(state.timestamp)
+
+        # Generate orders for each symbol traded this round, storing them in the result dictionary
+        if STARFRUIT in state.order_depths:
+            results[STARFRUIT] = self.generate_starfruit_orders(state)
+
+        if AMETHYST in state.order_depths:
+            results[AMETHYST] = self.generate_amethyst_orders(state)
+
+        if ORCHIDS in state.order_depths and ORCHIDS in state.observations.conversionObservations:
+            results[ORCHIDS], conversions = self.generate_orchid_orders(state)
+
+        if all(product in state.order_depths for product in (STRAWBERRIES, CHOCOLATE, ROSES, GIFT_BASKET)):
+            self.basket_spread.update(state, self.books)
+            results[STRAWBERRIES], results[GIFT_BASKET] = self.round_3_trades(state)
+
+        if COCONUT in state.order_depths and COCONUT_COUPON in state.order_depths:
+            results[COCONUT_COUPON] = self.generate_coconut_coupon_orders(state)
 
+        trader_data = self.dump_trader_data()
         return results, conversions, trader_data